@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Pimple Pink Binary Clock
+Drives the render loop and web handlers against the simulated hardware in
+sim/ and prints machine-readable JSON, so firmware revisions can be compared.
+
+Usage: python bench.py [--frames N] [--requests N] [--concurrency N] [--output FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import sim
+
+# (label, path, extra request headers, reuse one HTTP/1.1 connection per client)
+ENDPOINTS = [
+    ("/", "/", {}, False),
+    ("/ (If-None-Match)", "/", {'If-None-Match': 'PAGE_ETAG'}, False),
+    ("/static/app.js", "/static/app.js", {}, False),
+    ("/status", "/status", {}, False),
+    ("/status (keep-alive)", "/status", {}, True),
+    ("/frame", "/frame", {}, False),
+    ("/frame (keep-alive)", "/frame", {}, True),
+    ("/metrics", "/metrics", {}, False),
+    ("/mode/binary", "/mode/binary", {}, False),
+    ("/brightness/50", "/brightness/50", {}, False),
+    ("/palette/pink", "/palette/pink", {}, False),
+    ("/sync", "/sync", {}, False),
+    ("/clear", "/clear", {}, False),
+]
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def summarize(samples_ns):
+    """Timing summary in microseconds"""
+    return {
+        'count': len(samples_ns),
+        'mean_us': round(sum(samples_ns) / len(samples_ns) / 1000, 2) if samples_ns else 0,
+        'p50_us': round(percentile(samples_ns, 50) / 1000, 2),
+        'p90_us': round(percentile(samples_ns, 90) / 1000, 2),
+        'p99_us': round(percentile(samples_ns, 99) / 1000, 2),
+        'max_us': round(max(samples_ns) / 1000, 2) if samples_ns else 0,
+    }
+
+def measure(func, calls):
+    """Time each call, then measure per-call allocation in a second pass"""
+    timings = []
+    for i in range(calls):
+        start = time.perf_counter_ns()
+        func(i)
+        timings.append(time.perf_counter_ns() - start)
+
+    # tracemalloc slows everything down, so it gets its own pass
+    allocated = []
+    tracemalloc.start()
+    for i in range(calls):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func(i)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    result = summarize(timings)
+    result['alloc_mean_bytes'] = round(sum(allocated) / len(allocated), 1)
+    result['alloc_max_bytes'] = max(allocated)
+    return result
+
+def bench_render(core, web, frames):
+    """Per-frame cost of each renderer and of building the page"""
+    clock = core.clock
+
+    def binary(i):
+        # Walk real clock time so the frame cache sees normal hit rates
+        seconds = i % 86400
+        clock.display_binary_time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+    def rainbow(i):
+        clock.display_rainbow()
+
+    def page(i):
+        web.webpage("127.0.0.1")
+
+    return {
+        'binary_frame': measure(binary, frames),
+        'rainbow_frame': measure(rainbow, frames),
+        'webpage': measure(page, max(1, frames // 10)),
+        'strip_writes': core.output.writes,
+        'strip_writes_skipped': core.output.skipped,
+    }
+
+async def fetch(port, path, headers=""):
+    """One HTTP/1.0 GET; returns (status line, response length)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.0\r\nHost: bench\r\n{headers}\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    status = response.split(b"\r\n", 1)[0].decode()
+    return status, len(response)
+
+async def fetch_persistent(reader, writer, path, headers=""):
+    """One HTTP/1.1 GET on an open connection; returns (status line, body length)"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n{headers}\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line[15:])
+    body = await reader.readexactly(length)
+    return head.split(b"\r\n", 1)[0].decode(), len(body)
+
+async def bench_endpoint(port, path, headers, keep_alive, requests, concurrency):
+    """Request rate and latency percentiles for one endpoint"""
+    latencies = []
+    errors = 0
+
+    async def worker(count):
+        nonlocal errors
+        if keep_alive:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for _ in range(count):
+                start = time.perf_counter_ns()
+                try:
+                    await fetch_persistent(reader, writer, path, headers)
+                except (OSError, asyncio.IncompleteReadError):
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter_ns() - start)
+            writer.close()
+            await writer.wait_closed()
+            return
+        for _ in range(count):
+            start = time.perf_counter_ns()
+            try:
+                await fetch(port, path, headers)
+            except OSError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter_ns() - start)
+
+    share = requests // concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(share) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies)
+    result['requests_per_s'] = round(len(latencies) / elapsed, 1) if elapsed else 0
+    result['errors'] = errors
+    return result
+
+async def bench_http(core, web, requests, concurrency, with_clock):
+    """Run the firmware web server and hammer each endpoint in turn"""
+    tasks = [asyncio.create_task(web.web_server())]
+    if with_clock:
+        tasks.append(asyncio.create_task(core.clock_update()))
+    while sim.web_port() is None:
+        await asyncio.sleep(0.01)
+    port = sim.web_port()
+
+    results = {}
+    for label, path, extra, keep_alive in ENDPOINTS:
+        # Header values naming a web module attribute are resolved against it
+        headers = "".join(f"{name}: {getattr(web, value, value)}\r\n"
+                          for name, value in extra.items())
+        results[label] = await bench_endpoint(port, path, headers, keep_alive, requests, concurrency)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return results
+
+def firmware_revision():
+    """Short git revision of the working tree, if available"""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    """Run all benchmarks and emit JSON"""
+    parser = argparse.ArgumentParser(description="Benchmark the clock firmware on simulated hardware")
+    parser.add_argument('--frames', type=int, default=2000, help="frames per renderer")
+    parser.add_argument('--requests', type=int, default=200, help="requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=4, help="concurrent HTTP clients")
+    parser.add_argument('--with-clock', action='store_true',
+                        help="run clock_update alongside the web server")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    firmware = sim.load_firmware(port=0)
+    web = sim.load_web()
+
+    # Keep the firmware's per-request logging out of the measurements
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        render = bench_render(firmware.core, web, args.frames)
+        http = asyncio.run(bench_http(firmware.core, web, args.requests, args.concurrency,
+                                      args.with_clock))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    report = {
+        'revision': firmware_revision(),
+        'timestamp': int(time.time()),
+        'python': platform.python_version(),
+        'settings': {
+            'frames': args.frames,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'with_clock': args.with_clock,
+        },
+        'render': render,
+        'http': http,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
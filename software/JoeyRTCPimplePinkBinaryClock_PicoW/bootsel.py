@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+BOOTSEL drive detection for Pimple Pink Binary Clock host tools
+Finds every mounted RPI-RP2 drive. On Linux it reads /proc/self/mountinfo
+and sleeps until the kernel reports a mount table change, so a board is
+seen as soon as it is mounted. macOS and Windows fall back to a short poll.
+"""
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import string
+import sys
+import time
+
+MOUNTINFO = "/proc/self/mountinfo"
+DRIVE_LABEL = "RPI-RP2"
+UF2_INFO = "INFO_UF2.TXT"   # Present in the root of every UF2 bootloader drive
+FALLBACK_POLL = 0.1         # Seconds between scans without change notification
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+def unescape(field):
+    """Undo mountinfo's octal escapes (\\040 for space and so on)"""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+def is_drive_name(name, label=DRIVE_LABEL):
+    """The label itself or an automounter duplicate (RPI-RP21, "RPI-RP2 1")"""
+    if not name.startswith(label):
+        return False
+    suffix = name[len(label):].lstrip(" ")
+    return suffix.isdigit() or name == label
+
+def parse_mountinfo(text, label=DRIVE_LABEL):
+    """FAT mount points in mountinfo text named after the bootloader's volume label
+
+    Desktop automounters name the directory after the volume label and add
+    a suffix for duplicates, so a board shows up as RPI-RP2, RPI-RP21 or
+    "RPI-RP2 1". The filesystem type follows the "-" separator.
+    """
+    drives = []
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields[6:]:
+            continue
+        separator = fields.index("-", 6)
+        if fields[separator + 1:separator + 2] not in (["vfat"], ["msdos"]):
+            continue
+        mount_point = unescape(fields[4])
+        if is_drive_name(os.path.basename(mount_point), label):
+            drives.append(mount_point)
+    return drives
+
+def scan_volumes(root="/Volumes", label=DRIVE_LABEL):
+    """macOS: RPI-RP2 volumes under /Volumes"""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return []
+    return [os.path.join(root, name) for name in names if is_drive_name(name, label)]
+
+def scan_windows():
+    """Windows: drive letters carrying the UF2 bootloader's info file"""
+    drives = []
+    for letter in string.ascii_uppercase[2:]:
+        root = f"{letter}:\\"
+        if os.path.exists(os.path.join(root, UF2_INFO)):
+            drives.append(root)
+    return drives
+
+def find_drives(mountinfo=MOUNTINFO):
+    """Every mounted BOOTSEL drive, for flashing several boards at once"""
+    if os.path.exists(mountinfo):
+        with open(mountinfo) as f:
+            return parse_mountinfo(f.read())
+    if sys.platform == "win32":
+        return scan_windows()
+    return scan_volumes()
+
+class MountWatcher:
+    """Block until the mount table may have changed
+
+    procfs mount tables signal POLLPRI on every mount and unmount. Regular
+    files (a mount table copy in tests) are watched with inotify. Anything
+    else is re-read every FALLBACK_POLL seconds.
+    """
+    def __init__(self, path=MOUNTINFO):
+        self.path = path
+        self.file = None
+        self.poller = None
+        self.inotify = None
+        if not os.path.exists(path):
+            return
+        if path.startswith("/proc/"):
+            self.file = open(path, "rb")
+            self.poller = select.poll()
+            self.poller.register(self.file, select.POLLPRI | select.POLLERR)
+            self.file.read()  # Arm the event: it fires on changes after the last read
+        else:
+            self.inotify = self.watch_file(path)
+
+    @staticmethod
+    def watch_file(path):
+        """inotify descriptor watching path's directory, or None"""
+        name = ctypes.util.find_library("c")
+        if not name or not sys.platform.startswith("linux"):
+            return None
+        libc = ctypes.CDLL(name, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, directory, mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def wait(self, timeout):
+        """Sleep until a change is signalled or timeout seconds pass"""
+        if self.poller is not None:
+            if self.poller.poll(max(0, timeout) * 1000):
+                self.file.seek(0)
+                self.file.read()
+                return True
+            return False
+        if self.inotify is not None:
+            ready, _, _ = select.select([self.inotify], [], [], max(0, timeout))
+            if not ready:
+                return False
+            self.drain_inotify()
+            return True
+        time.sleep(min(FALLBACK_POLL, max(0, timeout)))
+        return True
+
+    def drain_inotify(self):
+        """Discard queued events; the caller re-reads the whole table anyway"""
+        while True:
+            try:
+                os.read(self.inotify, 4096)
+            except BlockingIOError:
+                return
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        if self.inotify is not None:
+            os.close(self.inotify)
+
+def wait_for_drives(timeout=10, mountinfo=MOUNTINFO):
+    """BOOTSEL drives, waiting up to timeout seconds for the first to appear"""
+    watcher = MountWatcher(mountinfo)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            drives = find_drives(mountinfo)
+            remaining = deadline - time.monotonic()
+            if drives or remaining <= 0:
+                return drives
+            watcher.wait(remaining)
+    finally:
+        watcher.close()
@@ -1,32 +1,21 @@
 #!/usr/bin/env python3
 """
 Simple script to check if Pico W is in bootloader mode
+Reports every mounted RPI-RP2 drive. On Linux it waits on mount table
+changes, so a board is reported the moment it is mounted.
 """
-import os
+import argparse
 import sys
-import time
 
-def check_bootloader():
-    """Check if RPI-RP2 drive is mounted (bootloader mode)"""
-    # Common mount points for macOS
-    mount_points = [
-        '/Volumes/RPI-RP2',
-        '/Volumes/RPI-RP2 1',  # Sometimes gets numbered
-    ]
-    
-    for mount_point in mount_points:
-        if os.path.exists(mount_point):
-            print(f"✅ Found Pico W in bootloader mode at: {mount_point}")
-            return True
-    
-    # Check if any RPI-RP2 volumes exist
-    volumes_dir = '/Volumes'
-    if os.path.exists(volumes_dir):
-        for item in os.listdir(volumes_dir):
-            if 'RPI-RP2' in item:
-                print(f"✅ Found Pico W in bootloader mode at: /Volumes/{item}")
-                return True
-    
+import bootsel
+
+def report(drives):
+    """Print what was found; True if any board is in bootloader mode"""
+    for drive in drives:
+        print(f"✅ Found Pico W in bootloader mode at: {drive}")
+    if drives:
+        return True
+
     print("❌ Pico W not found in bootloader mode")
     print("💡 Make sure to:")
     print("   1. Disconnect USB cable")
@@ -35,18 +24,25 @@ def check_bootloader():
     print("   4. Release BOOTSEL button")
     return False
 
+def check_bootloader(mountinfo=bootsel.MOUNTINFO):
+    """Check if RPI-RP2 drive is mounted (bootloader mode)"""
+    return report(bootsel.find_drives(mountinfo))
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wait for a Pico W in BOOTSEL mode")
+    parser.add_argument('--timeout', type=float, default=10, help="seconds to wait for a drive")
+    parser.add_argument('--mountinfo', default=bootsel.MOUNTINFO,
+                        help="mount table to watch (Linux)")
+    args = parser.parse_args()
+
     print("🔍 Checking for Pico W in bootloader mode...")
-    if check_bootloader():
+    drives = bootsel.find_drives(args.mountinfo)
+    if not drives:
+        print("⏳ Waiting for bootloader mode...")
+        drives = bootsel.wait_for_drives(args.timeout, args.mountinfo)
+    if report(drives):
         print("🎉 Ready for firmware flash!")
         print("💻 Run: make flash")
     else:
-        print("⏳ Waiting for bootloader mode...")
-        # Wait and check again
-        for i in range(10):
-            time.sleep(1)
-            if check_bootloader():
-                print("🎉 Ready for firmware flash!")
-                print("💻 Run: make flash")
-                sys.exit(0)
-        print("⚠️  Still not in bootloader mode. Please try the manual reset again.") 
\ No newline at end of file
+        print("⚠️  Still not in bootloader mode. Please try the manual reset again.")
+        sys.exit(1)
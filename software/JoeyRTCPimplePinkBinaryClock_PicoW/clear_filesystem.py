@@ -1,70 +1,59 @@
 #!/usr/bin/env python3
 """
 Script to clear the problematic main.py file from Pico W
+Interrupts the running program, removes the files in one raw REPL round
+trip and lists what is left, waiting on the board's prompts throughout.
 """
-import serial
-import time
+import argparse
 import sys
+import time
+
+from rawrepl import RawREPL, RawREPLError
 
-def clear_main_py(port='/dev/tty.usbmodem101', baud=115200):
-    """Try to interrupt running program and remove main.py"""
+def clear_main_py(port='/dev/tty.usbmodem101', baud=115200, files=("main.py",)):
+    """Interrupt the running program and remove main.py"""
     try:
         print("🔧 Connecting to Pico W...")
-        s = serial.Serial(port, baud, timeout=2)
-        
-        print("⏹️  Sending interrupt signals...")
-        # Send multiple interrupt signals to break out of running program
-        for i in range(15):
-            s.write(b'\x03')  # Ctrl+C
-            time.sleep(0.1)
-        
-        print("🔄 Attempting soft reset...")
-        s.write(b'\x04')  # Ctrl+D (soft reset)
-        time.sleep(2)
-        
-        print("💻 Trying to enter raw REPL...")
-        s.write(b'\x01')  # Ctrl+A (raw REPL)
-        time.sleep(1)
-        
-        # Clear any pending data
-        s.read(s.in_waiting or 0)
-        
-        print("🗑️  Attempting to remove main.py...")
-        commands = [
-            b'import os\r\n',
-            b'try:\r\n',
-            b'    os.remove("main.py")\r\n',
-            b'    print("main.py removed")\r\n',
-            b'except:\r\n',
-            b'    print("main.py not found or could not remove")\r\n',
-            b'\r\n'
-        ]
-        
-        for cmd in commands:
-            s.write(cmd)
-            time.sleep(0.2)
-        
-        time.sleep(2)
-        response = s.read(s.in_waiting or 0)
-        print("📄 Response:", repr(response))
-        
-        # Try to get to normal REPL
-        s.write(b'\x02')  # Ctrl+B (exit raw REPL)
-        time.sleep(1)
-        
-        s.close()
-        print("✅ Filesystem clear attempt completed")
+        start = time.monotonic()
+        repl = RawREPL.open(port, baud)
+        try:
+            print("⏹️  Interrupting and entering raw REPL...")
+            repl.enter()
+
+            print(f"🗑️  Removing {', '.join(files)}...")
+            for path, removed in repl.remove(files).items():
+                if removed:
+                    print(f"   {path} removed")
+                else:
+                    print(f"   {path} not found or could not remove")
+
+            print("📄 Files on device:")
+            for name, size, is_dir in repl.listdir():
+                print(f"   {name}/" if is_dir else f"   {name} ({size} bytes)")
+
+            # Back to the normal REPL
+            repl.exit()
+        finally:
+            repl.close()
+
+        print(f"✅ Filesystem clear attempt completed in {time.monotonic() - start:.2f}s")
         return True
-        
-    except Exception as e:
+
+    except (OSError, RawREPLError) as e:
         print(f"❌ Error: {e}")
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove files that stop the Pico W from booting cleanly")
+    parser.add_argument('--port', default='/dev/tty.usbmodem101', help="serial port")
+    parser.add_argument('files', nargs='*', default=["main.py"], help="device files to remove")
+    args = parser.parse_args()
+
     print("🧹 Clearing problematic files from Pico W...")
-    if clear_main_py():
+    if clear_main_py(args.port, files=args.files):
         print("🎉 Ready to upload fresh files!")
         print("💻 Run: make upload")
     else:
         print("⚠️  Could not clear filesystem automatically")
-        print("🔄 You may need to do another manual reset") 
\ No newline at end of file
+        print("🔄 You may need to do another manual reset")
+        sys.exit(1)
@@ -3,19 +3,29 @@
 # WiFi Settings
 WIFI_SSID = "sistersweetheart"
 WIFI_PASSWORD = "sabrinacunningham"
+WIFI_CONNECT_TIMEOUT = 10  # seconds to wait for a join attempt
+WIFI_CHECK_INTERVAL = 5    # seconds between link checks
+WIFI_BACKOFF_MAX = 120     # longest wait between reconnect attempts (seconds)
 
 # Hardware Configuration
 NEOPIXEL_PIN = 2
-NUM_PIXELS = 10  # 5x5 grid
+NUM_PIXELS = 10  # JF-PimpleClock board
+BOARD_LAYOUT = "pimple10"  # Bit-to-pixel map from layout.py ("pimple10" or "grid25")
 
 # Time Settings
 TIMEZONE_OFFSET = -8  # Hours from UTC (PST = -8, EST = -5, GMT = 0)
 NTP_SERVER = "pool.ntp.org"
+NTP_PORT = 123
+NTP_TIMEOUT_MS = 2000  # Give up on a reply after this long
 UPDATE_INTERVAL = 3600  # Sync time every hour (seconds)
+NTP_RETRY_INTERVAL = 60  # Retry sooner after a failed sync (seconds)
 
 # Display Settings
 DEFAULT_BRIGHTNESS = 50  # 10-100%
 DEFAULT_MODE = "binary"  # "binary" or "rainbow"
+BRIGHTNESS_GAMMA = 2.2  # Perceptual curve applied to the brightness level
+RAINBOW_STEP_MS = 70  # Time per hue step in rainbow mode (256 steps per cycle)
+MODE_FPS = {'binary': 1, 'rainbow': 30}  # Target frame rate per display mode
 
 # Colors (RGB values 0-255)
 COLORS = {
@@ -27,9 +37,32 @@ COLORS = {
     'warning': (255, 255, 0)  # Yellow for warnings
 }
 
+# Binary mode palettes: name -> (bit color, seconds accent color)
+PALETTES = {
+    'pink': (COLORS['on'], COLORS['accent']),
+    'dim': (COLORS['dim'], COLORS['accent']),
+    'green': (COLORS['accent'], COLORS['on'])
+}
+DEFAULT_PALETTE = "pink"
+FRAME_CACHE_SIZE = 4  # Finished frames kept by the binary renderer
+
 # Web Server Settings
 WEB_PORT = 80
-WEB_TIMEOUT = 30  # seconds
+WEB_TIMEOUT = 30  # seconds: idle keep-alive limit and time allowed to send headers
+MAX_REQUEST_LINE = 512   # bytes
+MAX_HEADER_LINE = 1024   # bytes
+MAX_HEADERS = 32         # header lines per request
+MAX_BODY = 256           # bytes accepted in a request body
+EVENTS_MAX_CLIENTS = 4  # Live /events subscribers allowed at once
+
+# Static assets (gzipped by install_micropython.py from www/)
+STATIC_DIR = "static"    # flash directory holding the .gz files
+STATIC_CHUNK = 512       # bytes per read/write when streaming a file
+
+# Memory Settings
+GC_THRESHOLD = 16384    # bytes allocated before MicroPython collects on its own
+GC_IDLE_BYTES = 4096    # collect after a frame once this much has been allocated
+GC_IDLE_MAX_MS = 1000   # and at least this often
 
 # Debug Settings
 DEBUG = True
@@ -0,0 +1,524 @@
+"""
+Render core for Pimple Pink Binary Clock
+Hardware, display state and the frame loop. Nothing here touches the
+network: net.py, timesync.py and web.py are imported by main.py only
+once WiFi is up.
+"""
+
+import time
+import neopixel
+from machine import Pin, RTC
+import uasyncio as asyncio
+import gc
+from array import array
+from framebuffer import FrameBuffer
+from layout import Layout
+from metrics import Registry, FAST_BUCKETS
+
+# Import configuration
+try:
+    from config import *
+except ImportError:
+    # Fallback configuration if config.py is missing
+    WIFI_SSID = "sistersweetheart"
+    WIFI_PASSWORD = "sabrinacunningham"
+    WIFI_CONNECT_TIMEOUT = 10
+    WIFI_CHECK_INTERVAL = 5
+    WIFI_BACKOFF_MAX = 120
+    NEOPIXEL_PIN = 2
+    NUM_PIXELS = 10
+    BOARD_LAYOUT = "pimple10"
+    TIMEZONE_OFFSET = -8
+    NTP_SERVER = "pool.ntp.org"
+    NTP_PORT = 123
+    NTP_TIMEOUT_MS = 2000
+    UPDATE_INTERVAL = 3600
+    NTP_RETRY_INTERVAL = 60
+    DEFAULT_BRIGHTNESS = 50
+    DEFAULT_MODE = "binary"
+    BRIGHTNESS_GAMMA = 2.2
+    RAINBOW_STEP_MS = 70
+    MODE_FPS = {'binary': 1, 'rainbow': 30}
+    WEB_PORT = 80
+    WEB_TIMEOUT = 30
+    MAX_REQUEST_LINE = 512
+    MAX_HEADER_LINE = 1024
+    MAX_HEADERS = 32
+    MAX_BODY = 256
+    STATIC_DIR = "static"
+    STATIC_CHUNK = 512
+    GC_THRESHOLD = 16384
+    GC_IDLE_BYTES = 4096
+    GC_IDLE_MAX_MS = 1000
+    EVENTS_MAX_CLIENTS = 4
+    COLORS = {
+        'off': (0, 0, 0),
+        'on': (255, 20, 147),
+        'dim': (50, 5, 30),
+        'accent': (0, 255, 25)
+    }
+    PALETTES = {'pink': (COLORS['on'], COLORS['accent'])}
+    DEFAULT_PALETTE = "pink"
+    FRAME_CACHE_SIZE = 4
+
+# Hardware setup
+np = neopixel.NeoPixel(Pin(NEOPIXEL_PIN), NUM_PIXELS)
+rtc = RTC()
+onboard_led = Pin("LED", Pin.OUT)
+
+# Display modes the clock can render
+MODES = ('binary', 'rainbow')
+
+# Global state
+display_mode = DEFAULT_MODE
+brightness = DEFAULT_BRIGHTNESS
+palette = DEFAULT_PALETTE
+web = None       # The web module, once main.py has loaded it
+boot_ms = 0      # ticks_ms() when the first frame went out
+boot_free = 0    # Free heap at that point
+
+# Metrics for /metrics. Hot paths record into preallocated arrays; values the
+# firmware already tracks are read only when scraped. The network modules
+# add their own when they load.
+metrics = Registry()
+frame_seconds = metrics.histogram(
+    'clock_frame_seconds', 'Time to render and show one frame', FAST_BUCKETS,
+    label='mode', labels=MODES)
+strip_write_seconds = metrics.histogram(
+    'clock_strip_write_seconds', 'Duration of np.write()', FAST_BUCKETS)
+metrics.gauge('clock_mem_free_bytes', 'Free heap', read=lambda: heap.sample())
+metrics.gauge('clock_mem_low_bytes', 'Lowest free heap seen', read=lambda: heap.low or 0)
+metrics.counter('clock_gc_collections_total', 'Idle-time collections',
+                read=lambda: heap.collections)
+metrics.counter('clock_frames_missed_total', 'Frames dropped by the scheduler',
+                read=lambda: scheduler.missed)
+metrics.counter('clock_strip_writes_skipped_total', 'Frames identical to the one showing',
+                read=lambda: output.skipped)
+metrics.gauge('clock_uptime_seconds', 'Seconds since boot', read=lambda: time.ticks_ms() // 1000)
+metrics.gauge('clock_boot_first_frame_seconds', 'Time from reset to the first frame',
+              read=lambda: boot_ms, scale=1000)
+metrics.gauge('clock_boot_mem_free_bytes', 'Free heap when the first frame went out',
+              read=lambda: boot_free)
+
+class PixelOutput:
+    """Write frames to the strip only when they differ from the last one"""
+    def __init__(self, strip, framebuffer):
+        self.strip = strip
+        self.fb = framebuffer
+        self.primed = False
+        self.writes = 0
+        self.skipped = 0
+
+    def show(self, frame):
+        """Push a GRB frame to the strip unless it is already showing"""
+        # The framebuffer is the driver's buffer, so it holds the last frame written
+        if self.primed and self.fb.matches(frame):
+            self.skipped += 1
+            return False
+        self.fb.blit(frame)
+        start = time.ticks_us()
+        self.strip.write()
+        strip_write_seconds.observe(time.ticks_diff(time.ticks_us(), start))
+        self.primed = True
+        self.writes += 1
+        return True
+
+fb = FrameBuffer(NUM_PIXELS, np)
+output = PixelOutput(np, fb)
+
+class BrightnessLUT:
+    """Gamma-corrected 256-entry channel table for one brightness level"""
+    def __init__(self, level):
+        self.table = bytearray(256)
+        self.level = None
+        self.set(level)
+
+    def set(self, level):
+        """Rebuild the table for a brightness level (10-100%)"""
+        if level == self.level:
+            return
+        self.level = level
+        scale = int(255 * (level / 100) ** BRIGHTNESS_GAMMA + 0.5)
+        table = self.table
+        for c in range(256):
+            table[c] = (c * scale + 127) // 255
+
+lut = BrightnessLUT(brightness)
+
+def set_brightness(level):
+    """Change the brightness level and rebuild the lookup table"""
+    global brightness
+    brightness = max(10, min(100, level))
+    lut.set(brightness)
+
+def set_mode(mode):
+    """Switch display mode; the frame loop picks it up on its next wake"""
+    global display_mode
+    display_mode = mode
+
+def set_palette(name):
+    """Switch the binary mode palette"""
+    global palette
+    palette = name
+
+def hue_to_rgb(hue):
+    """Full-saturation RGB for an 8-bit hue using integer math"""
+    sector = hue * 6 >> 8
+    rise = hue * 6 & 0xFF
+    fall = 255 - rise
+    if sector == 0:
+        return (255, rise, 0)
+    elif sector == 1:
+        return (fall, 255, 0)
+    elif sector == 2:
+        return (0, 255, rise)
+    elif sector == 3:
+        return (0, fall, 255)
+    elif sector == 4:
+        return (rise, 0, 255)
+    return (255, 0, fall)
+
+class HueTable:
+    """256-entry GRB hue wheel at the current brightness"""
+    def __init__(self):
+        self.table = bytearray(256 * 3)
+        self.level = None
+
+    def get(self):
+        """Return the table, rebuilding it if brightness changed"""
+        if self.level != lut.level:
+            self.level = lut.level
+            scale = lut.table
+            table = self.table
+            for hue in range(256):
+                r, g, b = hue_to_rgb(hue)
+                offset = hue * 3
+                table[offset] = scale[g]
+                table[offset + 1] = scale[r]
+                table[offset + 2] = scale[b]
+        return self.table
+
+hue_table = HueTable()
+
+class FrameCache:
+    """Finished GRB frames keyed by (hour, minute, second parity, brightness, palette)"""
+    def __init__(self, size=FRAME_CACHE_SIZE):
+        self.size = size
+        self.frames = {}
+        self.order = []
+        self.brightness = None
+        self.palette = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the cached frame for key, or None"""
+        # Brightness and palette are the last two key fields; a change to
+        # either makes every stored frame stale
+        if key[3] != self.brightness or key[4] != self.palette:
+            self.clear()
+            self.brightness = key[3]
+            self.palette = key[4]
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return frame
+
+    def put(self, key, frame):
+        """Store a frame, evicting the oldest one when full"""
+        if len(self.order) >= self.size:
+            del self.frames[self.order.pop(0)]
+        self.frames[key] = frame
+        self.order.append(key)
+
+    def clear(self):
+        """Drop all cached frames"""
+        self.frames = {}
+        self.order = []
+
+class BinaryClock:
+    def __init__(self):
+        self.last_update = 0
+        self.frame_cache = FrameCache()
+        self.layout = Layout(BOARD_LAYOUT, NUM_PIXELS)
+        self.blank_frame = bytes(NUM_PIXELS * 3)
+        self.rainbow_frame = bytearray(NUM_PIXELS * 3)
+        # Hue offsets in 1/256ths of a table step; the fractions stagger when
+        # each pixel moves to its next entry, so every frame changes something
+        self.rainbow_spread = array('H', (i * 65536 // NUM_PIXELS for i in range(NUM_PIXELS)))
+        
+    def clear_display(self):
+        """Clear all pixels"""
+        output.show(self.blank_frame)
+        
+    def display_binary_time(self, hours, minutes, seconds):
+        """Display time in binary using the board's pixel layout"""
+        hours = self.layout.hour_value(hours)
+        # Parity only matters on boards with a seconds pixel
+        parity = seconds % 2 if self.layout.seconds else 0
+        key = (hours, minutes, parity, brightness, palette)
+        frame = self.frame_cache.get(key)
+        if frame is None:
+            frame = self.render_binary_frame(hours, minutes, seconds)
+            self.frame_cache.put(key, frame)
+        output.show(frame)
+
+    def render_binary_frame(self, hours, minutes, seconds):
+        """Build the GRB byte frame for a binary time"""
+        frame = bytearray(NUM_PIXELS * 3)
+        on, accent = PALETTES[palette]
+        layout = self.layout
+
+        for mask, pixel in layout.hours:
+            if hours & mask:
+                self.put_frame_pixel(frame, pixel, on)
+
+        for mask, pixel in layout.minutes:
+            if minutes & mask:
+                self.put_frame_pixel(frame, pixel, on)
+
+        # Seconds indicator (just show if even/odd)
+        if seconds % 2 == 0:
+            for pixel in layout.seconds:
+                self.put_frame_pixel(frame, pixel, accent)
+
+        return frame
+
+    def put_frame_pixel(self, frame, index, color):
+        """Write a brightness-scaled RGB color into a GRB frame"""
+        table = lut.table
+        offset = index * 3
+        frame[offset] = table[color[1]]
+        frame[offset + 1] = table[color[0]]
+        frame[offset + 2] = table[color[2]]
+
+    def display_rainbow(self):
+        """Display a rainbow pattern"""
+        table = hue_table.get()
+        frame = self.rainbow_frame
+        spread = self.rainbow_spread
+        # 16-bit phase: 256 per RAINBOW_STEP_MS, kept small-int sized on the Pico
+        period = RAINBOW_STEP_MS * 256
+        phase = time.ticks_ms() % period * 256 // RAINBOW_STEP_MS
+        offset = 0
+        for i in range(NUM_PIXELS):
+            hue = ((spread[i] + phase) & 0xFFFF) >> 8
+            hue *= 3
+            frame[offset] = table[hue]
+            frame[offset + 1] = table[hue + 1]
+            frame[offset + 2] = table[hue + 2]
+            offset += 3
+        output.show(frame)
+
+SECOND_LEAD_MS = 20  # Wake this early before an expected RTC second
+SECOND_POLL_MS = 5   # RTC polling step while waiting for the second to roll
+SECOND_SLACK_MS = 100  # Ticks-vs-RTC disagreement tolerated before calling it an RTC step
+
+class FrameScheduler:
+    """Deadline-based frame pacing with per-mode frame rates"""
+    def __init__(self):
+        self.deadline = time.ticks_ms()
+        self.expected = None
+        self.shown = time.ticks_ms()
+        self.frames = 0
+        self.missed = 0
+        self.jitter_max = 0
+        self.jitter_total = 0
+
+    async def wait(self):
+        """Sleep until the current deadline"""
+        delay = time.ticks_diff(self.deadline, time.ticks_ms())
+        if delay > 0:
+            await asyncio.sleep_ms(delay)
+
+    def reset(self):
+        """Render the next frame immediately, e.g. after a mode change"""
+        self.deadline = time.ticks_ms()
+        self.expected = None
+
+    def record(self, target):
+        """Record how far from its target time a frame was shown"""
+        jitter = abs(time.ticks_diff(time.ticks_ms(), target))
+        self.frames += 1
+        self.jitter_total += jitter
+        if jitter > self.jitter_max:
+            self.jitter_max = jitter
+
+    def next_frame(self, mode):
+        """Advance the deadline by one period of the mode's frame rate"""
+        period = 1000 // MODE_FPS.get(mode, 1)
+        self.record(self.deadline)
+        self.deadline = time.ticks_add(self.deadline, period)
+        late = time.ticks_diff(time.ticks_ms(), self.deadline)
+        if late > 0:
+            # Already past the next deadline: drop the frames we cannot show
+            skipped = late // period + 1
+            self.missed += skipped
+            self.deadline = time.ticks_add(self.deadline, skipped * period)
+
+    def poll_second(self):
+        """Check the RTC again shortly; the second has not rolled over yet"""
+        self.deadline = time.ticks_add(time.ticks_ms(), SECOND_POLL_MS)
+
+    def next_second(self, skipped):
+        """Align the next wake-up to the RTC second that was just observed roll over"""
+        now = time.ticks_ms()
+        if self.expected is not None:
+            self.record(self.expected)
+        if skipped:
+            self.missed += skipped
+        self.expected = time.ticks_add(now, 1000)
+        self.deadline = time.ticks_add(now, 1000 - SECOND_LEAD_MS)
+
+    def second_shown(self, gap):
+        """Note a binary frame gap seconds after the last; returns seconds missed
+
+        Only a gap the ticks clock agrees with was missed. Anything else, such
+        as an NTP sync moving the RTC, returns -1 for a resync.
+        """
+        now = time.ticks_ms()
+        elapsed = time.ticks_diff(now, self.shown)
+        self.shown = now
+        if gap is None:
+            return 0
+        if (gap - 1) * 1000 - SECOND_SLACK_MS <= elapsed <= (gap + 1) * 1000 + SECOND_SLACK_MS:
+            return gap - 1
+        return -1
+
+    def seek_second(self, skipped):
+        """Shown at an unknown point in the second: poll for the next rollover"""
+        if skipped:
+            self.missed += skipped
+        self.expected = None
+        self.poll_second()
+
+    def jitter_avg(self):
+        """Mean distance from target time, in milliseconds"""
+        return self.jitter_total // self.frames if self.frames else 0
+
+class HeapManager:
+    """Collect garbage between frames and track free-heap low-water marks"""
+    def __init__(self):
+        self.low = None
+        self.collections = 0
+        self.collect_us_max = 0
+        self.alloc_after = 0
+        self.last = time.ticks_ms()
+
+    def boot(self):
+        """Compact the boot-time allocations and arm the GC threshold"""
+        gc.collect()
+        gc.threshold(GC_THRESHOLD)
+        self.alloc_after = gc.mem_alloc()
+        self.low = gc.mem_free()
+        self.last = time.ticks_ms()
+        print(f"💾 Heap: {self.low} bytes free after boot, GC threshold {GC_THRESHOLD}")
+
+    def sample(self):
+        """Fold the current free heap into the low-water mark"""
+        free = gc.mem_free()
+        if self.low is None or free < self.low:
+            self.low = free
+        return free
+
+    def idle(self):
+        """Collect now, while nothing is drawing, if enough garbage has built up"""
+        now = time.ticks_ms()
+        if (gc.mem_alloc() - self.alloc_after < GC_IDLE_BYTES
+                and time.ticks_diff(now, self.last) < GC_IDLE_MAX_MS):
+            return False
+        # Free heap is lowest just before a collection
+        self.sample()
+        start = time.ticks_us()
+        gc.collect()
+        spent = time.ticks_diff(time.ticks_us(), start)
+        if spent > self.collect_us_max:
+            self.collect_us_max = spent
+        self.collections += 1
+        self.alloc_after = gc.mem_alloc()
+        self.last = now
+        return True
+
+heap = HeapManager()
+
+# Initialize clock
+clock = BinaryClock()
+scheduler = FrameScheduler()
+
+def get_current_time():
+    """Get current time from RTC"""
+    dt = rtc.datetime()
+    return (dt[4], dt[5], dt[6])  # hour, minute, second
+
+def redraw():
+    """Render the current mode right away instead of at the next frame"""
+    if display_mode == "binary":
+        current_time = get_current_time()
+        clock.display_binary_time(current_time[0], current_time[1], current_time[2])
+    elif display_mode == "rainbow":
+        clock.display_rainbow()
+
+async def clock_update():
+    """Update the clock display"""
+    last_mode = None
+    last_second = None
+    last_tick = None
+    last_beat = None
+    rolling = False  # Saw the previous second still showing since the last frame
+    while True:
+        await scheduler.wait()
+        try:
+            mode = display_mode
+            if mode != last_mode:
+                scheduler.reset()
+                last_mode = mode
+                last_second = None
+                rolling = False
+
+            if mode == "binary":
+                current_time = get_current_time()
+                if current_time[2] == last_second:
+                    # Woke just ahead of the RTC tick
+                    rolling = True
+                    scheduler.poll_second()
+                    continue
+                start = time.ticks_us()
+                clock.display_binary_time(current_time[0], current_time[1], current_time[2])
+                frame_seconds.observe(time.ticks_diff(time.ticks_us(), start), 0)
+                gap = None if last_second is None else (current_time[2] - last_second) % 60
+                skipped = scheduler.second_shown(gap)
+                last_second = current_time[2]
+                if rolling and skipped >= 0:
+                    scheduler.next_second(skipped)
+                else:
+                    # After boot, a mode switch, an RTC step or a late wake the
+                    # second changed at an unknown time; anchor on a seen rollover
+                    scheduler.seek_second(max(skipped, 0))
+                rolling = False
+                if web is not None:
+                    web.tick(current_time)
+            else:
+                if mode == "rainbow":
+                    start = time.ticks_us()
+                    clock.display_rainbow()
+                    frame_seconds.observe(time.ticks_diff(time.ticks_us(), start), 1)
+                scheduler.next_frame(mode)
+                tick = time.ticks_ms() // 1000
+                if tick != last_tick and web is not None:
+                    last_tick = tick
+                    web.tick(get_current_time())
+                
+            # Heartbeat
+            beat = time.ticks_ms() // 2000
+            if beat != last_beat:
+                onboard_led.toggle()
+                last_beat = beat
+                
+            # The frame is out; use the gap before the next one to collect
+            heap.idle()
+            
+        except Exception as e:
+            print(f"Clock update error: {e}")
+            scheduler.next_frame(display_mode)
@@ -0,0 +1,44 @@
+"""
+Compact NeoPixel framebuffer for Pimple Pink Binary Clock
+Pixels are stored in a single bytearray in wire (GRB) order
+"""
+
+class FrameBuffer:
+    """Pixel data in GRB order, shared with the NeoPixel driver"""
+    def __init__(self, num_pixels, strip=None):
+        self.num_pixels = num_pixels
+        self.buf = bytearray(num_pixels * 3)
+        self.mv = memoryview(self.buf)
+        if strip is not None:
+            # Hand our buffer to the driver so np.write() sends it as-is
+            strip.buf = self.buf
+
+    def fill(self, color):
+        """Set every pixel to an RGB color"""
+        r, g, b = color
+        buf = self.buf
+        for offset in range(0, len(buf), 3):
+            buf[offset] = g
+            buf[offset + 1] = r
+            buf[offset + 2] = b
+
+    def set(self, index, color):
+        """Set one pixel to an RGB color"""
+        offset = index * 3
+        self.buf[offset] = color[1]
+        self.buf[offset + 1] = color[0]
+        self.buf[offset + 2] = color[2]
+
+    def get(self, index):
+        """Return one pixel as an RGB tuple"""
+        offset = index * 3
+        return (self.buf[offset + 1], self.buf[offset], self.buf[offset + 2])
+
+    def blit(self, frame, index=0):
+        """Copy a precomputed GRB frame in, starting at a pixel index"""
+        offset = index * 3
+        self.mv[offset:offset + len(frame)] = frame
+
+    def matches(self, frame):
+        """True if the buffer already holds exactly this frame"""
+        return self.buf == frame
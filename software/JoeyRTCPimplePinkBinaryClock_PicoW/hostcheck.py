@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Host tool checks for Pimple Pink Binary Clock
+Runs the uploader and clear_filesystem.py against the pty REPL stand-in in
+sim/fakerepl.py, so the raw REPL protocol, the interrupt handshake and the
+skip-unchanged logic are exercised without a board, and BOOTSEL detection
+against temporary mount tables.
+Exits non-zero if any check fails.
+
+Usage: python hostcheck.py [-k NAME]
+"""
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import bootsel
+import clear_filesystem
+import install_micropython
+from rawrepl import RawREPL
+
+# fakerepl flags for each device personality the tools have to cope with
+DEVICES = [
+    ("raw-paste", []),
+    ("no raw-paste, slow", ["--no-paste", "--delay", "5"]),
+    ("pre-raw-paste firmware", ["--legacy"]),
+    ("busy main.py", ["--busy", "3"]),
+]
+
+@contextlib.contextmanager
+def fake_device(root, flags=()):
+    """Serve a fake REPL on a pty with root as its flash; yields the pty path"""
+    process = subprocess.Popen([sys.executable, "-m", "sim.fakerepl", "--root", root, *flags],
+                               stdout=subprocess.PIPE, text=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        yield process.stdout.readline().strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def check_upload(flags):
+    """Upload everything, then nothing, then only the file that changed"""
+    with tempfile.TemporaryDirectory() as local, tempfile.TemporaryDirectory() as flash:
+        files = []
+        for name, size in (("main.py", 300), ("static/app.js.gz", 9000)):
+            path = os.path.join(local, os.path.basename(name))
+            write(path, os.urandom(size))
+            files.append((path, name))
+
+        with fake_device(flash, flags) as port:
+            def sync():
+                with RawREPL.open(port) as repl, contextlib.redirect_stdout(io.StringIO()):
+                    return install_micropython.sync_files(repl, files, chunk=1024)[:2]
+
+            assert sync() == (2, 0), "first upload should send every file"
+            assert sync() == (0, 2), "unchanged files were sent again"
+            write(files[0][0], b"print('edited')\n")
+            assert sync() == (1, 1), "only the edited file should be sent"
+
+        for path, name in files:
+            assert read(os.path.join(flash, name)) == read(path), f"{name} differs on the device"
+        assert not [n for n in os.listdir(flash) if n.endswith(".part")], "temp file left behind"
+
+def check_clear(flags):
+    """Remove main.py, keep everything else, and list what is left"""
+    with tempfile.TemporaryDirectory() as flash:
+        write(os.path.join(flash, "main.py"), b"while True: pass\n")
+        write(os.path.join(flash, "config.py"), b"WIFI_SSID = 'x'\n")
+        os.mkdir(os.path.join(flash, "static"))
+
+        with fake_device(flash, flags) as port:
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert clear_filesystem.clear_main_py(port), "clear_main_py reported failure"
+            with RawREPL.open(port) as repl:
+                listing = sorted((name, is_dir) for name, _, is_dir in repl.listdir())
+                assert repl.remove(["main.py"]) == {"main.py": False}, "main.py removed twice"
+
+        assert listing == [("config.py", False), ("static", True)], f"left {listing}"
+
+MOUNT_ROOT = "22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw\n"
+MOUNT_BOARDS = ("90 22 8:17 / /media/pi/RPI-RP2 rw,nosuid shared:50 - vfat /dev/sdb1 rw\n"
+                "91 22 8:33 / /media/pi/RPI-RP2\\0401 rw,nosuid - vfat /dev/sdc1 rw\n")
+MOUNT_DECOYS = ("92 22 8:49 / /mnt/RPI-RP2-backup rw - vfat /dev/sdd1 rw\n"
+                "93 22 8:65 / /mnt/RPI-RP2 rw - ext4 /dev/sde1 rw\n")
+MOUNT_LATENCY = 0.25   # Seconds allowed between the table changing and the drives being seen
+
+def check_bootsel_wait(_):
+    """Both boards are reported promptly once they appear in the mount table"""
+    with tempfile.TemporaryDirectory() as directory:
+        mountinfo = os.path.join(directory, "mountinfo")
+        write(mountinfo, MOUNT_ROOT.encode())
+        mounted = []
+
+        def mount():
+            time.sleep(0.2)
+            mounted.append(time.monotonic())
+            with open(mountinfo, "a") as f:
+                f.write(MOUNT_DECOYS + MOUNT_BOARDS)
+
+        threading.Thread(target=mount).start()
+        drives = bootsel.wait_for_drives(5, mountinfo)
+        latency = time.monotonic() - mounted[0]
+        assert drives == ["/media/pi/RPI-RP2", "/media/pi/RPI-RP2 1"], f"found {drives}"
+        assert latency < MOUNT_LATENCY, f"took {latency:.3f}s to notice the mount"
+
+def check_bootsel_decoys(_):
+    """Look-alike names and non-FAT mounts are never taken for a board"""
+    with tempfile.TemporaryDirectory() as directory:
+        mountinfo = os.path.join(directory, "mountinfo")
+        write(mountinfo, (MOUNT_ROOT + MOUNT_DECOYS).encode())
+        drives = bootsel.wait_for_drives(0.3, mountinfo)
+        assert drives == [], f"found {drives}"
+
+CHECKS = ([(f"upload ({label})", check_upload, flags) for label, flags in DEVICES] +
+          [(f"clear ({label})", check_clear, flags) for label, flags in DEVICES] +
+          [("bootsel wait", check_bootsel_wait, None),
+           ("bootsel decoys", check_bootsel_decoys, None)])
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the host tools against simulated devices")
+    parser.add_argument('-k', dest='pattern', default="", help="only run checks whose name contains this")
+    args = parser.parse_args()
+
+    failed = 0
+    for name, check, arg in CHECKS:
+        if args.pattern not in name:
+            continue
+        start = time.monotonic()
+        try:
+            check(arg)
+            print(f"✅ {name} ({time.monotonic() - start:.2f}s)")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {name}: {type(e).__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,71 @@ This script helps install MicroPython firmware and upload files to Pico W
 
 import os
 import sys
+import time
+import gzip
+import base64
+import hashlib
+import argparse
 import subprocess
 import urllib.request
 import shutil
 from pathlib import Path
 
+import bootsel
+from rawrepl import RawREPL, RawREPLError
+
 # MicroPython firmware URL for Pico W
 MICROPYTHON_URL = "https://micropython.org/resources/firmware/RPI_PICO_W-20250415-v1.25.0.uf2"
 FIRMWARE_FILE = "micropython-firmware-pico-w-290622.uf2"
 
+# Web page assets: sources in www/, gzipped into build/static/ for upload
+STATIC_SOURCE = "www"
+STATIC_BUILD = os.path.join("build", "static")
+STATIC_REMOTE = "static"
+
+# Firmware files copied to the Pico's root
+FIRMWARE_FILES = [
+    "main.py",
+    "core.py",
+    "net.py",
+    "timesync.py",
+    "web.py",
+    "config.py",
+    "framebuffer.py",
+    "layout.py",
+    "sntp.py",
+    "static.py",
+    "metrics.py",
+]
+
+UPLOAD_CHUNK = 4096  # File bytes sent per device-side exec
+
+# Device-side helpers, run once per session in the raw REPL
+DEVICE_SETUP = """
+import os, hashlib, binascii
+def _hash(p):
+    try:
+        f = open(p, 'rb')
+    except OSError:
+        return '-'
+    s = hashlib.sha256()
+    b = bytearray(1024)
+    m = memoryview(b)
+    while True:
+        n = f.readinto(b)
+        if not n:
+            break
+        s.update(m[:n])
+    f.close()
+    return binascii.hexlify(s.digest()).decode()
+def _mkdir(p):
+    try:
+        os.mkdir(p)
+    except OSError:
+        pass
+_d = binascii.a2b_base64
+"""
+
 def check_dependencies():
     """Check if required tools are installed"""
     print("Checking dependencies...")
@@ -27,14 +83,6 @@ def check_dependencies():
         print("❌ pyserial not found. Install with: pip install pyserial")
         return False
     
-    # Check for ampy (for file upload)
-    try:
-        result = subprocess.run(['ampy', '--help'], capture_output=True, text=True)
-        print("✅ ampy found")
-    except FileNotFoundError:
-        print("❌ ampy not found. Install with: pip install adafruit-ampy")
-        return False
-    
     return True
 
 def download_firmware():
@@ -52,48 +100,42 @@ def download_firmware():
         print(f"❌ Failed to download firmware: {e}")
         return False
 
-def find_pico_drive():
-    """Find the Pico drive when in BOOTSEL mode"""
-    possible_paths = [
-        "/Volumes/RPI-RP2",  # macOS
-        "/media/*/RPI-RP2",  # Linux
-        "D:\\",              # Windows (common)
-        "E:\\",              # Windows (alternative)
-        "F:\\",              # Windows (alternative)
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
+def find_pico_drives(timeout=10):
+    """Every Pico drive in BOOTSEL mode, waiting up to timeout seconds for one"""
+    return bootsel.wait_for_drives(timeout)
 
 def flash_firmware():
-    """Flash MicroPython firmware to Pico W"""
+    """Flash MicroPython firmware to every Pico W in BOOTSEL mode"""
     print("\n🔧 Flashing MicroPython firmware...")
     print("1. Hold the BOOTSEL button on your Pico W")
     print("2. Connect the Pico W to your computer via USB")
     print("3. Release the BOOTSEL button")
     print("4. The Pico should appear as a USB drive named 'RPI-RP2'")
+    print("   Several boards can be connected at once; each one is flashed")
     
     input("Press Enter when the Pico W is connected in BOOTSEL mode...")
     
-    pico_drive = find_pico_drive()
-    if not pico_drive:
+    pico_drives = find_pico_drives()
+    if not pico_drives:
         print("❌ Cannot find Pico drive. Make sure it's connected in BOOTSEL mode.")
         return False
     
-    print(f"Found Pico drive at: {pico_drive}")
+    flashed = 0
+    for pico_drive in pico_drives:
+        print(f"Found Pico drive at: {pico_drive}")
+        try:
+            firmware_dest = os.path.join(pico_drive, FIRMWARE_FILE)
+            shutil.copy2(FIRMWARE_FILE, firmware_dest)
+            print(f"✅ Firmware copied to {pico_drive}")
+            flashed += 1
+        except Exception as e:
+            print(f"❌ Failed to copy firmware to {pico_drive}: {e}")
     
-    try:
-        firmware_dest = os.path.join(pico_drive, FIRMWARE_FILE)
-        shutil.copy2(FIRMWARE_FILE, firmware_dest)
-        print("✅ Firmware copied to Pico W")
+    if flashed == 1:
         print("The Pico W should automatically reboot with MicroPython")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to copy firmware: {e}")
-        return False
+    elif flashed:
+        print(f"The {flashed} boards should automatically reboot with MicroPython")
+    return flashed == len(pico_drives)
 
 def find_serial_port():
     """Find the serial port for the Pico W"""
@@ -118,37 +160,112 @@ def find_serial_port():
     
     return None
 
-def upload_files():
-    """Upload Python files to Pico W"""
+def build_static(source=STATIC_SOURCE, dest=STATIC_BUILD):
+    """Gzip the web assets; returns the paths of the .gz files"""
+    os.makedirs(dest, exist_ok=True)
+    built = []
+    for name in sorted(os.listdir(source)):
+        path = os.path.join(source, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        # mtime=0 keeps the output, and so the device's ETag, stable between builds
+        packed = gzip.compress(data, compresslevel=9, mtime=0)
+        target = os.path.join(dest, name + ".gz")
+        with open(target, "wb") as f:
+            f.write(packed)
+        print(f"📦 {name}: {len(data)} -> {len(packed)} bytes")
+        built.append(target)
+    return built
+
+def sha256_file(path):
+    """Hex SHA-256 of a local file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def upload_manifest():
+    """(local path, remote path) for every file the clock needs"""
+    files = [(name, name) for name in FIRMWARE_FILES]
+    for path in build_static():
+        files.append((path, STATIC_REMOTE + "/" + os.path.basename(path)))
+    return files
+
+def device_hashes(repl, remotes):
+    """SHA-256 of each remote file, or None where it doesn't exist"""
+    output = repl.exec(f"for p in {remotes!r}:\n    print(p, _hash(p))\n")
+    hashes = {}
+    for line in output.splitlines():
+        remote, _, digest = line.rpartition(" ")
+        hashes[remote] = None if digest == "-" else digest
+    return hashes
+
+def write_file(repl, local, remote, chunk=UPLOAD_CHUNK):
+    """Stream a file over in base64 chunks, then swap it into place"""
+    with open(local, "rb") as f:
+        data = f.read()
+    # Write beside the target so an interrupted upload never leaves half a main.py
+    temp = remote + ".part"
+    repl.exec(f"_f = open({temp!r}, 'wb')\n_w = _f.write\n")
+    for i in range(0, len(data), chunk):
+        repl.exec(f"_w(_d({base64.b64encode(data[i:i + chunk])!r}))\n")
+    digest = repl.exec(
+        f"_f.close()\n"
+        f"try:\n    os.remove({remote!r})\nexcept OSError:\n    pass\n"
+        f"os.rename({temp!r}, {remote!r})\n"
+        f"print(_hash({remote!r}))\n").strip()
+    if digest != sha256_file(local):
+        raise RawREPLError(f"{remote} failed verification after upload")
+    return len(data)
+
+def sync_files(repl, files, force=False, chunk=UPLOAD_CHUNK):
+    """Upload files whose on-device hash differs; returns (sent, skipped, bytes)"""
+    repl.exec(DEVICE_SETUP)
+    for directory in sorted({os.path.dirname(remote) for _, remote in files} - {""}):
+        repl.exec(f"_mkdir({directory!r})\n")
+        
+    remote_hashes = {} if force else device_hashes(repl, [remote for _, remote in files])
+    sent = skipped = total = 0
+    for local, remote in files:
+        if not force and remote_hashes.get(remote) == sha256_file(local):
+            skipped += 1
+            continue
+        size = write_file(repl, local, remote, chunk)
+        print(f"✅ Uploaded {remote} ({size} bytes)")
+        sent += 1
+        total += size
+    return sent, skipped, total
+
+def upload_files(port=None, force=False):
+    """Upload the firmware and web assets over one raw REPL session"""
     print("\n📁 Uploading files to Pico W...")
     
-    port = find_serial_port()
+    port = port or find_serial_port()
     if not port:
         print("❌ Cannot find Pico W serial port")
         return False
     
     print(f"Using serial port: {port}")
     
-    files_to_upload = [
-        "main.py",
-        "config.py",
-    ]
+    files = []
+    for local, remote in upload_manifest():
+        if os.path.exists(local):
+            files.append((local, remote))
+        else:
+            print(f"❌ File not found: {local}")
     
-    for file in files_to_upload:
-        if not os.path.exists(file):
-            print(f"❌ File not found: {file}")
-            continue
-        
-        try:
-            cmd = ["ampy", "-p", port, "put", file]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ Uploaded {file}")
-            else:
-                print(f"❌ Failed to upload {file}: {result.stderr}")
-        except Exception as e:
-            print(f"❌ Error uploading {file}: {e}")
+    start = time.monotonic()
+    try:
+        with RawREPL.open(port) as repl:
+            sent, skipped, total = sync_files(repl, files, force)
+    except (OSError, RawREPLError) as e:
+        print(f"❌ Upload failed: {e}")
+        return False
+    elapsed = time.monotonic() - start
     
+    rate = total / elapsed if elapsed else 0
+    print(f"📊 {sent} uploaded, {skipped} unchanged; {total} bytes in {elapsed:.2f}s "
+          f"({rate:.0f} bytes/s)")
     return True
 
 def setup_config():
@@ -176,9 +293,21 @@ def setup_config():
 
 def main():
     """Main installation process"""
+    parser = argparse.ArgumentParser(description="Flash MicroPython and install the clock")
+    parser.add_argument('--upload', action='store_true',
+                        help="only upload changed files to an already-flashed Pico W")
+    parser.add_argument('--port', help="serial port (default: detect)")
+    parser.add_argument('--force', action='store_true', help="upload files even if unchanged")
+    args = parser.parse_args()
+    
     print("🕐 Pimple Pink Binary Clock - MicroPython Setup")
     print("=" * 50)
     
+    if args.upload:
+        if not upload_files(args.port, args.force):
+            sys.exit(1)
+        return
+    
     # Check dependencies
     if not check_dependencies():
         print("\n❌ Please install missing dependencies and try again")
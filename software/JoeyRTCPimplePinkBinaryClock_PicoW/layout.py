@@ -0,0 +1,54 @@
+"""
+Board pixel layouts for Pimple Pink Binary Clock
+Maps each displayed bit to the physical NeoPixel index that shows it
+"""
+
+# For each board, bit N of the hours/minutes value lights pixel N of its
+# tuple (least significant bit first). 'seconds' pixels light on even seconds.
+LAYOUTS = {
+    # JF-PimpleClock PCB: 4 hour pixels then 6 minute pixels, as in the _r2 sketch
+    'pimple10': {
+        'hours': (0, 1, 2, 3),
+        'minutes': (4, 5, 6, 7, 8, 9),
+        'seconds': (),
+        'hour_format': 12,
+    },
+    # 5x5 grid: hours on the top row, minutes from the third row, bottom centre blinks
+    'grid25': {
+        'hours': (0, 1, 2, 3, 4),
+        'minutes': (10, 11, 12, 13, 14, 15),
+        'seconds': (22,),
+        'hour_format': 24,
+    },
+}
+
+class Layout:
+    """Bit-to-pixel table for one board, precomputed at boot"""
+    def __init__(self, board, num_pixels):
+        spec = LAYOUTS[board]
+        self.board = board
+        self.hour_format = spec['hour_format']
+        # (bit mask, pixel) pairs, leaving out pixels the strip does not have
+        self.hours = self.build(spec['hours'], num_pixels)
+        self.minutes = self.build(spec['minutes'], num_pixels)
+        self.seconds = tuple(p for p in spec['seconds'] if p < num_pixels)
+
+    def build(self, pixels, num_pixels):
+        """Pair each bit mask with its pixel index"""
+        return tuple((1 << bit, pixel) for bit, pixel in enumerate(pixels) if pixel < num_pixels)
+
+    def hour_value(self, hours):
+        """Hours as shown on this board (1-12 on 12-hour boards)"""
+        if self.hour_format == 12:
+            return hours % 12 or 12
+        return hours
+
+    def rows(self):
+        """Hours, minutes and seconds pixel groups in bit order, for drawing the board
+
+        Groups the board does not have are left out.
+        """
+        groups = (tuple(pixel for _, pixel in self.hours),
+                  tuple(pixel for _, pixel in self.minutes),
+                  self.seconds)
+        return tuple(group for group in groups if group)
@@ -0,0 +1,153 @@
+"""
+Metrics registry for Pimple Pink Binary Clock
+Counters, gauges and fixed-bucket histograms kept in preallocated arrays,
+so recording an event never allocates, rendered in Prometheus text format
+"""
+from array import array
+
+# Histogram bucket upper bounds in microseconds
+FAST_BUCKETS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+SLOW_BUCKETS = (1000, 5000, 10000, 25000, 50000, 100000, 250000, 1000000)
+
+def label_sets(name, labels):
+    """Pre-format {name="value"} selectors, or one empty selector"""
+    if not labels:
+        return ('',)
+    return tuple('{%s="%s"}' % (name, value) for value in labels)
+
+class Counter:
+    """Monotonic count, optionally one per label value"""
+    kind = 'counter'
+    scale = 1  # Values are in 1/scale base units, e.g. 1000 for milliseconds
+
+    def __init__(self, name, help, label=None, labels=None, read=None):
+        self.name = name
+        self.help = help
+        self.selectors = label_sets(label, labels)
+        self.values = array('I', [0] * len(self.selectors))
+        self.read = read  # Callable for values the firmware already counts
+
+    def inc(self, index=0, amount=1):
+        self.values[index] += amount
+
+    def samples(self):
+        """Yield (suffix, value) pairs for rendering"""
+        if self.read is not None:
+            yield self.selectors[0], self.read()
+            return
+        for i, selector in enumerate(self.selectors):
+            yield selector, self.values[i]
+
+class Gauge(Counter):
+    """Value that can go up and down; read at scrape time if given a callable"""
+    kind = 'gauge'
+
+    def __init__(self, name, help, label=None, labels=None, read=None, scale=1):
+        super().__init__(name, help, label, labels, read)
+        self.values = array('i', [0] * len(self.selectors))
+        self.scale = scale
+
+    def set(self, value, index=0):
+        self.values[index] = value
+
+class Histogram:
+    """Durations in microseconds counted into fixed buckets"""
+    kind = 'histogram'
+
+    def __init__(self, name, help, bounds, label=None, labels=None):
+        self.name = name
+        self.help = help
+        self.bounds = bounds
+        self.selectors = label_sets(label, labels)
+        # Buckets are rendered with an le label next to the selector's own
+        self.bucket_selectors = tuple(
+            '{' + (s[1:-1] + ',' if s else '') + 'le="%s"}' for s in self.selectors)
+        self.limits = tuple(seconds(bound) for bound in bounds) + ('+Inf',)
+        width = len(bounds) + 1
+        self.counts = array('I', [0] * (width * len(self.selectors)))
+        # Sums kept as whole seconds plus microseconds so neither overflows
+        self.sum_s = array('I', [0] * len(self.selectors))
+        self.sum_us = array('I', [0] * len(self.selectors))
+
+    def observe(self, us, index=0):
+        """Record one duration; a short scan over a handful of bounds"""
+        bounds = self.bounds
+        n = len(bounds)
+        i = 0
+        while i < n and us > bounds[i]:
+            i += 1
+        self.counts[index * (n + 1) + i] += 1
+        total = self.sum_us[index] + us
+        if total >= 1000000:
+            self.sum_s[index] += total // 1000000
+            total %= 1000000
+        self.sum_us[index] = total
+
+    def lines(self, out, index):
+        """Append one label set's bucket, sum and count lines"""
+        width = len(self.bounds) + 1
+        name = self.name
+        selector = self.selectors[index]
+        base = index * width
+        bucket = self.bucket_selectors[index]
+        running = 0
+        for i in range(width):
+            running += self.counts[base + i]
+            out.append('%s_bucket%s %d\n' % (name, bucket % self.limits[i], running))
+        out.append('%s_sum%s %d.%06d\n' % (name, selector, self.sum_s[index], self.sum_us[index]))
+        out.append('%s_count%s %d\n' % (name, selector, running))
+
+def decimal(value, scale):
+    """Integer in 1/scale units (scale a power of ten) as a decimal literal"""
+    sign = '-' if value < 0 else ''
+    value = abs(value)
+    # Adding scale zero-pads the fraction: 5 ms -> '1005' -> '005'
+    fraction = ('%d' % (value % scale + scale))[1:]
+    return (sign + '%d.%s' % (value // scale, fraction)).rstrip('0').rstrip('.')
+
+def seconds(us):
+    """Microseconds as a Prometheus seconds literal"""
+    return decimal(us, 1000000)
+
+class Registry:
+    """Every metric the firmware exposes, in registration order"""
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.add(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self.add(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.add(Histogram(*args, **kwargs))
+
+    def chunks(self):
+        """Prometheus text exposition format, one metric or label set at a time
+
+        Each piece is a few hundred bytes, so a scrape can be streamed to the
+        socket without ever holding the whole body.
+        """
+        for metric in self.metrics:
+            out = ['# HELP %s %s\n# TYPE %s %s\n' % (metric.name, metric.help, metric.name, metric.kind)]
+            if metric.kind == 'histogram':
+                for index in range(len(metric.selectors)):
+                    metric.lines(out, index)
+                    yield ''.join(out)
+                    out = []
+                continue
+            for selector, value in metric.samples():
+                if metric.scale == 1:
+                    out.append('%s%s %d\n' % (metric.name, selector, value))
+                else:
+                    out.append('%s%s %s\n' % (metric.name, selector, decimal(value, metric.scale)))
+            yield ''.join(out)
+
+    def render(self):
+        """The whole exposition as one string, for host-side tools"""
+        return ''.join(self.chunks())
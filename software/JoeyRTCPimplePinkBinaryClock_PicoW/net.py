@@ -0,0 +1,85 @@
+"""
+WiFi link for Pimple Pink Binary Clock
+Imported by main.py after the first frame is on the strip
+"""
+import network
+import uasyncio as asyncio
+import core
+from core import onboard_led, WIFI_SSID, WIFI_PASSWORD, WIFI_CONNECT_TIMEOUT, \
+    WIFI_CHECK_INTERVAL, WIFI_BACKOFF_MAX
+
+class WiFiManager:
+    """Owns the WLAN interface and caches link state and IP address"""
+    def __init__(self):
+        self.wlan = network.WLAN(network.STA_IF)
+        self.connected = False
+        self.ip = None
+        self.reconnects = 0
+        self.backoff = WIFI_CHECK_INTERVAL
+        self.up = asyncio.Event()   # Set while the link is up
+
+    def rssi(self):
+        """Signal strength in dBm, or 0 without a link"""
+        if not self.connected:
+            return 0
+        try:
+            return self.wlan.status('rssi')
+        except (OSError, ValueError):
+            return 0
+
+    def refresh(self):
+        """Re-read link state from the interface (never blocks)"""
+        self.connected = self.wlan.isconnected()
+        if self.connected:
+            self.ip = self.wlan.ifconfig()[0]
+            onboard_led.on()
+            self.up.set()
+        else:
+            self.ip = None
+            self.up.clear()
+        return self.connected
+
+    async def connect(self):
+        """Join the network, yielding to other tasks while waiting"""
+        wlan = self.wlan
+        wlan.active(True)
+        
+        if not wlan.isconnected():
+            print(f"Connecting to WiFi: {WIFI_SSID}")
+            wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+            
+            waited = 0
+            while waited < WIFI_CONNECT_TIMEOUT * 1000 and not wlan.isconnected():
+                onboard_led.toggle()
+                await asyncio.sleep_ms(250)
+                waited += 250
+                
+        if self.refresh():
+            print(f"WiFi connected! IP: {self.ip}")
+        else:
+            onboard_led.off()
+            print("WiFi connection failed")
+        return self.ip
+
+    async def run(self):
+        """Watch the link and reconnect with exponential backoff"""
+        while True:
+            await asyncio.sleep(self.backoff)
+            if self.refresh():
+                self.backoff = WIFI_CHECK_INTERVAL
+                continue
+                
+            self.reconnects += 1
+            print(f"WiFi down, reconnecting (attempt {self.reconnects})")
+            if await self.connect():
+                self.backoff = WIFI_CHECK_INTERVAL
+            else:
+                self.backoff = min(self.backoff * 2, WIFI_BACKOFF_MAX)
+
+wifi = WiFiManager()
+
+core.metrics.gauge('clock_wifi_connected', 'WiFi link state', read=lambda: int(wifi.connected))
+core.metrics.gauge('clock_wifi_rssi_dbm', 'WiFi signal strength (0 when down)',
+                   read=lambda: wifi.rssi())
+core.metrics.counter('clock_wifi_reconnects_total', 'WiFi reconnect attempts',
+                     read=lambda: wifi.reconnects)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Raw REPL client for Pimple Pink Binary Clock host tools
+Speaks MicroPython's raw REPL protocol over one serial session, waiting on
+the device's own prompts instead of fixed sleeps. Uses raw-paste mode
+(flow-controlled, compiled as it streams in) when the firmware supports it.
+"""
+import ast
+import struct
+import time
+
+RAW_BANNER = b"raw REPL; CTRL-B to exit\r\n>"
+CTRL_A, CTRL_B, CTRL_C, CTRL_D = b"\x01", b"\x02", b"\x03", b"\x04"
+RAW_PASTE = b"\x05A\x01"
+RAW_CHUNK = 256   # Bytes per write when raw-paste is unavailable
+INTERRUPT_WAIT = 0.25  # Seconds to wait for a prompt after each Ctrl-C
+INTERRUPT_ATTEMPTS = 15
+
+# Device-side scripts; each is one round trip and prints a Python literal
+LIST_SCRIPT = """
+import os
+_r = []
+for _n in os.listdir({path!r}):
+    _s = os.stat({prefix!r} + _n)
+    _r.append((_n, _s[6], _s[0] & 0x4000 != 0))
+print(repr(_r))
+"""
+
+REMOVE_SCRIPT = """
+import os
+_r = {{}}
+for _p in {paths!r}:
+    try:
+        os.remove(_p)
+        _r[_p] = True
+    except OSError:
+        _r[_p] = False
+print(repr(_r))
+"""
+
+class RawREPLError(Exception):
+    """The device did not answer the way the raw REPL protocol expects"""
+
+class DeviceError(RawREPLError):
+    """Code run on the device raised; the message is its traceback"""
+
+class RawREPL:
+    """One raw REPL session on a pyserial-style port (read, write, in_waiting)"""
+    def __init__(self, port, timeout=10):
+        self.port = port
+        self.timeout = timeout
+        self.use_paste = True
+        self.pending = b""
+
+    @classmethod
+    def open(cls, device, baud=115200, timeout=10):
+        """Open a serial device; short read timeouts keep marker waits responsive"""
+        import serial
+        return cls(serial.Serial(device, baud, timeout=0.05), timeout)
+
+    def __enter__(self):
+        self.enter()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.exit()
+        finally:
+            self.close()
+
+    def close(self):
+        self.port.close()
+
+    def read_until(self, marker, timeout=None):
+        """Read until marker arrives; returns everything before it"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        data = self.pending
+        while True:
+            found = data.find(marker)
+            if found >= 0:
+                self.pending = data[found + len(marker):]
+                return data[:found]
+            if time.monotonic() > deadline:
+                self.pending = b""
+                raise RawREPLError(f"timed out waiting for {marker!r}, got {data[-80:]!r}")
+            data += self.port.read(max(1, self.port.in_waiting))
+
+    def wait_for(self, marker, timeout):
+        """True if marker arrives within timeout seconds"""
+        try:
+            self.read_until(marker, timeout)
+            return True
+        except RawREPLError:
+            return False
+
+    def read_exact(self, count, timeout=None):
+        """Read exactly count bytes"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        data = self.pending
+        while len(data) < count:
+            if time.monotonic() > deadline:
+                raise RawREPLError(f"timed out reading {count} bytes, got {data!r}")
+            data += self.port.read(count - len(data))
+        self.pending = data[count:]
+        return data[:count]
+
+    def interrupt(self, attempts=INTERRUPT_ATTEMPTS):
+        """Ctrl-C until the friendly >>> prompt appears; True once it does
+
+        Ctrl-B follows each Ctrl-C so a board left in the raw REPL also comes
+        back to the prompt. Returns as soon as the prompt shows instead of
+        sending a fixed number of interrupts.
+        """
+        for _ in range(attempts):
+            self.port.write(b"\r" + CTRL_C + CTRL_B)
+            if self.wait_for(b">>> ", INTERRUPT_WAIT):
+                return True
+        return False
+
+    def enter(self):
+        """Stop whatever is running and switch to the raw REPL"""
+        if not self.interrupt():
+            raise RawREPLError("no REPL prompt; is a program ignoring Ctrl-C?")
+        self.port.write(b"\r" + CTRL_A)
+        # Anything printed before the banner (tracebacks, >>> prompts) is dropped
+        self.read_until(RAW_BANNER)
+
+    def exit(self):
+        """Back to the friendly REPL"""
+        self.port.write(b"\r" + CTRL_B)
+
+    def soft_reset(self):
+        """Soft reboot without leaving the raw REPL; main.py is not run"""
+        self.port.write(CTRL_D)
+        self.read_until(b"soft reboot\r\n")
+        self.read_until(RAW_BANNER)
+
+    def send(self, code):
+        """Submit code, in raw-paste mode if the device supports it"""
+        if self.use_paste:
+            self.port.write(RAW_PASTE)
+            reply = self.read_exact(2)
+            if reply == b"R\x01":
+                self.paste(code)
+                return
+            if reply != b"R\x00":
+                # Firmware without raw-paste answers the request's Ctrl-A by
+                # reprinting the banner; the two bytes read are its start
+                self.pending = reply + self.pending
+                self.read_until(RAW_BANNER)
+            self.use_paste = False
+        for i in range(0, len(code), RAW_CHUNK):
+            self.port.write(code[i:i + RAW_CHUNK])
+        self.port.write(CTRL_D)
+        self.read_until(b"OK")
+
+    def paste(self, code):
+        """Stream code within the device's flow-control window"""
+        window = struct.unpack("<H", self.read_exact(2))[0]
+        remaining = window
+        sent = 0
+        while sent < len(code):
+            while remaining == 0 or self.pending or self.port.in_waiting:
+                flag = self.read_exact(1)
+                if flag == b"\x01":
+                    remaining += window
+                elif flag == CTRL_D:
+                    # Device aborted, usually a compile error; acknowledge it
+                    self.port.write(CTRL_D)
+                    return
+                else:
+                    raise RawREPLError(f"unexpected {flag!r} during raw paste")
+            block = code[sent:sent + remaining]
+            self.port.write(block)
+            remaining -= len(block)
+            sent += len(block)
+        self.port.write(CTRL_D)
+        self.read_until(CTRL_D)
+
+    def exec_raw(self, code, timeout=None):
+        """Run code; returns (stdout, stderr) as bytes with \\n line endings"""
+        if isinstance(code, str):
+            code = code.encode()
+        self.send(code)
+        out = self.read_until(CTRL_D, timeout)
+        err = self.read_until(CTRL_D, timeout)
+        self.read_until(b">", timeout)
+        return out.replace(b"\r\n", b"\n"), err.replace(b"\r\n", b"\n")
+
+    def exec(self, code, timeout=None):
+        """Run code and return its output as text; raises DeviceError if it failed"""
+        out, err = self.exec_raw(code, timeout)
+        if err:
+            raise DeviceError(err.decode(errors="replace").strip())
+        return out.decode(errors="replace")
+
+    def run(self, script, **params):
+        """Run a script that prints one Python literal, and return its value"""
+        return ast.literal_eval(self.exec(script.format(**params)).strip())
+
+    def listdir(self, path="."):
+        """[(name, size, is_dir)] for a device directory"""
+        prefix = "" if path == "." else path.rstrip("/") + "/"
+        return self.run(LIST_SCRIPT, path=path, prefix=prefix)
+
+    def remove(self, paths):
+        """Delete device files; returns {path: removed}"""
+        return self.run(REMOVE_SCRIPT, paths=list(paths))
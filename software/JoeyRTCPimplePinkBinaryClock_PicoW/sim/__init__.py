@@ -0,0 +1,151 @@
+"""
+Host-side hardware stand-ins for Pimple Pink Binary Clock
+Lets the MicroPython firmware run unmodified under CPython on Linux
+
+    import sim
+    firmware = sim.load_firmware(port=0)
+    asyncio.run(firmware.main())
+
+firmware.core is the render core. load_web() imports the network modules
+directly, as main.py does once WiFi is up. serve_ntp() starts a local UDP
+NTP stand-in for the firmware's SNTP client.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+_installed = False
+_static_dir = None
+
+def _install_time():
+    """Add the MicroPython time extensions to CPython's time module"""
+    # MicroPython's clock has no timezone; match it so RTC and localtime agree
+    os.environ['TZ'] = 'UTC'
+    time.tzset()
+
+    period = 1 << 30
+    start = time.monotonic_ns()
+
+    def ticks_ms():
+        return ((time.monotonic_ns() - start) // 1000000) % period
+
+    def ticks_us():
+        return ((time.monotonic_ns() - start) // 1000) % period
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) % period
+
+    def ticks_diff(end, begin):
+        return ((end - begin + period // 2) % period) - period // 2
+
+    time.ticks_ms = ticks_ms
+    time.ticks_us = ticks_us
+    time.ticks_cpu = ticks_us
+    time.ticks_add = ticks_add
+    time.ticks_diff = ticks_diff
+    time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+    time.sleep_us = lambda us: time.sleep(us / 1000000)
+
+HEAP_SIZE = 192 * 1024  # Roughly what a Pico W has free after boot
+
+def _install_gc():
+    """Add MicroPython's heap queries to CPython's gc module
+
+    CPython has no fixed heap, so mem_alloc() reports tracemalloc's traced
+    size while tracing is on and 0 otherwise; mem_free() is the rest of a
+    HEAP_SIZE heap.
+    """
+    threshold = [-1]
+
+    def mem_alloc():
+        if tracemalloc.is_tracing():
+            return min(HEAP_SIZE, tracemalloc.get_traced_memory()[0])
+        return 0
+
+    def mem_free():
+        return HEAP_SIZE - mem_alloc()
+
+    def set_threshold(amount=None):
+        if amount is None:
+            return threshold[0]
+        threshold[0] = amount
+
+    gc.mem_alloc = mem_alloc
+    gc.mem_free = mem_free
+    gc.threshold = set_threshold
+
+def install():
+    """Register the stand-in modules under their MicroPython names"""
+    global _installed
+    if _installed:
+        return
+    _install_time()
+    _install_gc()
+
+    from sim import machine, neopixel, network, ntptime, uasyncio
+    sys.modules['machine'] = machine
+    sys.modules['neopixel'] = neopixel
+    sys.modules['network'] = network
+    sys.modules['ntptime'] = ntptime
+    sys.modules['uasyncio'] = uasyncio
+    _installed = True
+
+def build_static():
+    """Gzip www/ into a temporary directory standing in for the flash copy"""
+    import tempfile
+    import install_micropython
+    global _static_dir
+    if _static_dir is None:
+        _static_dir = tempfile.mkdtemp(prefix="clock-static-")
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            install_micropython.build_static(dest=_static_dir)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+    return _static_dir
+
+def load_firmware(port=0, **settings):
+    """Install the stand-ins and import main.py with config overrides
+
+    port 0 binds the web server to an ephemeral port; see web_port().
+    Static assets are built from www/ the same way the uploader does it.
+    """
+    install()
+    import config
+    config.WEB_PORT = port
+    config.STATIC_DIR = build_static()
+    for name, value in settings.items():
+        setattr(config, name, value)
+    import main
+    return main
+
+def load_web():
+    """Import the web module (and with it net and timesync) and hook it to the frame loop"""
+    import core
+    import web
+    core.web = web
+    return web
+
+async def serve_ntp(offset=0.0, delay=0.0):
+    """Start a local NTP stand-in and point the firmware at it"""
+    from sim import ntpserver
+    server, port = await ntpserver.start(offset=offset, delay=delay)
+    # timesync copies its settings from core on import, so patch both
+    for name in ('core', 'timesync'):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.NTP_SERVER = "127.0.0.1"
+            module.NTP_PORT = port
+    return server
+
+def web_port():
+    """Port the firmware's web server is listening on, or None"""
+    from sim import uasyncio
+    for server in uasyncio.servers:
+        for sock in server.sockets:
+            return sock.getsockname()[1]
+    return None
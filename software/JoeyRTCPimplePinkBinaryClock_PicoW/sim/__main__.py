@@ -0,0 +1,30 @@
+"""
+Boot the Pimple Pink Binary Clock firmware on a Linux host
+Usage: python -m sim [--port PORT]
+"""
+import argparse
+import asyncio
+
+import sim
+
+def main():
+    """Run main.main() against the simulated hardware"""
+    parser = argparse.ArgumentParser(description="Run the clock firmware on simulated hardware")
+    parser.add_argument('--port', type=int, default=0,
+                        help="web server port (default: ephemeral)")
+    args = parser.parse_args()
+
+    firmware = sim.load_firmware(port=args.port)
+
+    async def boot():
+        await sim.serve_ntp()
+        await firmware.main()
+
+    try:
+        asyncio.run(boot())
+    except KeyboardInterrupt:
+        print("Shutting down...")
+        firmware.core.clock.clear_display()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Pty-backed stand-in for a MicroPython board's USB REPL
+Speaks the friendly REPL, raw REPL and raw-paste protocols and runs the code
+it is sent with CPython, inside a directory standing in for the flash
+filesystem. Host tools can open the printed pty path like a serial port.
+
+Usage: python -m sim.fakerepl [--root DIR] [--delay MS] [--no-paste] [--legacy] [--busy N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import pty
+import struct
+import sys
+import time
+import traceback
+import tty
+
+BANNER = b"raw REPL; CTRL-B to exit\r\n>"
+FRIENDLY = b"MicroPython (fake REPL) on sim\r\nType \"help()\" for more information.\r\n>>> "
+PASTE_WINDOW = 128
+
+class FakeREPL:
+    """Byte-at-a-time REPL state machine on the master side of a pty"""
+    def __init__(self, fd, delay=0.0, paste=True, busy=0, legacy=False):
+        self.fd = fd
+        self.delay = delay      # Seconds to stall before each reply, like a busy board
+        self.paste = paste
+        self.legacy = legacy    # Firmware from before raw-paste: \x05 is just input
+        self.busy_start = busy  # Ctrl-Cs main.py takes to stop, after each reset
+        self.busy = busy
+        self.raw = False
+        self.code = bytearray()
+        self.scope = {'__name__': '__main__'}
+        self.execs = 0
+
+    def write(self, data):
+        os.write(self.fd, data)
+
+    def read(self):
+        try:
+            return os.read(self.fd, 4096)
+        except OSError:
+            return b""   # Client closed the pty
+
+    def reply(self, data):
+        if self.delay:
+            time.sleep(self.delay)
+        self.write(data)
+
+    def run_code(self, code):
+        """Execute like pyexec: stdout, then \\x04, then the traceback, then \\x04"""
+        self.execs += 1
+        out = io.StringIO()
+        err = ""
+        with contextlib.redirect_stdout(out):
+            try:
+                exec(compile(bytes(code).decode(), "<stdin>", "exec"), self.scope)
+            except Exception:
+                err = traceback.format_exc()
+        crlf = lambda text: text.replace("\n", "\r\n").encode()
+        self.reply(crlf(out.getvalue()) + b"\x04" + crlf(err) + b"\x04>")
+
+    def serve(self):
+        """Handle input until the client goes away"""
+        data = b""
+        while True:
+            chunk = self.read()
+            if not chunk:
+                return
+            data += chunk
+            while data:
+                data = self.feed(data)
+
+    def feed(self, data):
+        """Consume what it can from data; returns the unconsumed rest"""
+        byte, rest = data[:1], data[1:]
+        if self.busy:
+            # main.py is running: silent, and deaf to anything but Ctrl-C
+            if byte == b"\x03":
+                self.busy -= 1
+                if not self.busy:
+                    self.reply(b"Traceback (most recent call last):\r\n"
+                               b"KeyboardInterrupt: \r\n" + FRIENDLY)
+            return rest
+        if not self.raw:
+            if byte == b"\x01":
+                self.raw = True
+                self.code = bytearray()
+                self.reply(b"\r\n" + BANNER)
+            elif byte == b"\x02":
+                self.reply(b"\r\n" + FRIENDLY)
+            elif byte == b"\x03":
+                self.reply(b"\r\nKeyboardInterrupt\r\n>>> ")
+            elif byte == b"\x04":
+                # A friendly-REPL soft reset runs main.py again
+                self.reply(b"MPY: soft reboot\r\n")
+                self.busy = self.busy_start
+                if not self.busy:
+                    self.reply(FRIENDLY)
+            elif byte == b"\r":
+                self.reply(b"\r\n>>> ")
+            return rest
+
+        if byte == b"\x01":
+            # pyexec_raw_repl reprints the banner with no leading newline
+            self.code = bytearray()
+            self.reply(BANNER)
+        elif byte == b"\x02":
+            self.raw = False
+            self.reply(b"\r\n" + FRIENDLY)
+        elif byte == b"\x03":
+            self.code = bytearray()
+        elif byte == b"\x04":
+            if self.code:
+                self.reply(b"OK")
+                self.run_code(self.code)
+                self.code = bytearray()
+            else:
+                self.reply(b"OK\r\nMPY: soft reboot\r\n" + BANNER)
+        elif byte == b"\x05" and not self.code and not self.legacy:
+            # Raw-paste request: \x05 A \x01
+            if len(rest) < 2:
+                return self.wait_for(data)
+            if rest[:2] != b"A\x01":
+                self.code += byte
+                return rest
+            if not self.paste:
+                self.reply(b"R\x00")
+                return rest[2:]
+            self.reply(b"R\x01" + struct.pack("<H", PASTE_WINDOW) + b"\x01")
+            return self.receive_paste(rest[2:])
+        else:
+            self.code += byte
+        return rest
+
+    def wait_for(self, data):
+        """Block until more input arrives and hand back the joined bytes"""
+        more = self.read()
+        return data + more if more else b""
+
+    def receive_paste(self, data):
+        """Accept paste data in windows, granting more each time one is used"""
+        code = bytearray()
+        used = 0
+        while True:
+            if not data:
+                data = self.read()
+                if not data:
+                    return b""
+            end = data.find(b"\x04")
+            part = data if end < 0 else data[:end]
+            code += part
+            used += len(part)
+            while used >= PASTE_WINDOW:
+                used -= PASTE_WINDOW
+                self.write(b"\x01")
+            if end >= 0:
+                self.reply(b"\x04")
+                self.run_code(code)
+                return data[end + 1:]
+            data = b""
+
+def main():
+    """Open a pty, print its path and serve until interrupted"""
+    parser = argparse.ArgumentParser(description="Fake MicroPython REPL on a pty")
+    parser.add_argument('--root', default=".", help="directory standing in for the flash filesystem")
+    parser.add_argument('--delay', type=float, default=0,
+                        help="milliseconds to stall before each reply")
+    parser.add_argument('--no-paste', action='store_true', help="refuse raw-paste mode")
+    parser.add_argument('--legacy', action='store_true',
+                        help="behave like firmware from before raw-paste existed")
+    parser.add_argument('--busy', type=int, default=0,
+                        help="Ctrl-Cs needed to stop the pretend main.py")
+    args = parser.parse_args()
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    os.chdir(args.root)
+    print(os.ttyname(slave), flush=True)
+    device = FakeREPL(master, args.delay / 1000, not args.no_paste, args.busy, args.legacy)
+    try:
+        # A client closing the pty shows up as EOF; keep serving the next one
+        while True:
+            device.serve()
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    sys.exit(main())
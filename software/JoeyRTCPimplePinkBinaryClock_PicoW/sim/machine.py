@@ -0,0 +1,103 @@
+"""
+Stand-ins for machine.Pin, machine.RTC and machine.Timer
+"""
+import calendar
+import threading
+import time
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = mode
+        self.pull = pull
+        self._value = 0 if value is None else int(bool(value))
+
+    def value(self, value=None):
+        if value is None:
+            return self._value
+        self._value = int(bool(value))
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+    def toggle(self):
+        self._value ^= 1
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def __repr__(self):
+        return f"Pin({self.id!r})"
+
+# The Pico has one RTC; every RTC() instance shares it
+_rtc_offset = 0
+
+class RTC:
+    def datetime(self, datetimetuple=None):
+        """Get or set (year, month, day, weekday, hours, minutes, seconds, subseconds)"""
+        global _rtc_offset
+        now = time.time()
+        if datetimetuple is None:
+            t = time.gmtime(now + _rtc_offset)
+            return (t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0)
+        year, month, day, _, hours, minutes, seconds = datetimetuple[:7]
+        target = calendar.timegm((year, month, day, hours, minutes, seconds, 0, 0, 0))
+        _rtc_offset = target - int(now)
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self._timer = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self.deinit()
+        if freq > 0:
+            period = 1000 / freq
+        self.mode = mode
+        self.period = period
+        self.callback = callback
+        self._start()
+
+    def _start(self):
+        self._timer = threading.Timer(self.period / 1000, self._fire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _fire(self):
+        if self.mode == Timer.PERIODIC:
+            self._start()
+        if self.callback:
+            self.callback(self)
+
+    def deinit(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+resets = 0
+
+def reset():
+    """Record the reset instead of rebooting the host"""
+    global resets
+    resets += 1
+    print("machine.reset() (simulated)")
+
+def freq(hz=None):
+    return 125000000
+
+def unique_id():
+    return b'\xe6\x61\x41\x04\x03\x2b\x5e\x2a'
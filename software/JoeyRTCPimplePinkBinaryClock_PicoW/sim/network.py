@@ -0,0 +1,62 @@
+"""
+Stand-in for the network module: a WLAN that joins instantly on loopback
+Set WLAN.reachable = False to simulate losing the access point; a joined
+interface comes back by itself once it is reachable again
+"""
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_WRONG_PASSWORD = -3
+STAT_NO_AP_FOUND = -2
+STAT_CONNECT_FAIL = -1
+STAT_GOT_IP = 3
+
+class WLAN:
+    reachable = True
+    address = ('127.0.0.1', '255.0.0.0', '127.0.0.1', '127.0.0.1')
+    rssi = -50
+
+    # Like the real driver, WLAN(STA_IF) always returns the same interface
+    _interfaces = {}
+
+    def __new__(cls, interface=STA_IF):
+        if interface not in cls._interfaces:
+            wlan = super().__new__(cls)
+            wlan.interface = interface
+            wlan._active = False
+            wlan._joined = False
+            wlan.connects = 0
+            cls._interfaces[interface] = wlan
+        return cls._interfaces[interface]
+
+    def active(self, state=None):
+        if state is None:
+            return self._active
+        self._active = bool(state)
+        if not self._active:
+            self._joined = False
+
+    def connect(self, ssid=None, key=None):
+        self.connects += 1
+        self.ssid = ssid
+        self._joined = self._active
+
+    def disconnect(self):
+        self._joined = False
+
+    def isconnected(self):
+        return self._joined and WLAN.reachable
+
+    def status(self, param=None):
+        if param == 'rssi':
+            return WLAN.rssi
+        if self.isconnected():
+            return STAT_GOT_IP
+        return STAT_CONNECT_FAIL if self.connects else STAT_IDLE
+
+    def ifconfig(self, config=None):
+        if self.isconnected():
+            return WLAN.address
+        return ('0.0.0.0', '0.0.0.0', '0.0.0.0', '0.0.0.0')
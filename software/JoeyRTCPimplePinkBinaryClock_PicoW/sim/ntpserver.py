@@ -0,0 +1,50 @@
+"""
+Local UDP NTP stand-in that answers from the host clock
+"""
+import asyncio
+import struct
+import time
+
+NTP_DELTA = 2208988800
+
+def ntp_stamp(seconds):
+    """Unix seconds as a 64-bit NTP timestamp"""
+    whole = int(seconds)
+    return whole + NTP_DELTA, int((seconds - whole) * (1 << 32)) & 0xFFFFFFFF
+
+class NTPServer(asyncio.DatagramProtocol):
+    """Answers SNTP requests; offset skews the clock, delay holds each reply"""
+    def __init__(self, offset=0.0, delay=0.0):
+        self.offset = offset
+        self.delay = delay
+        self.requests = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 48:
+            return
+        self.requests += 1
+        received = time.time() + self.offset
+        reply = bytearray(48)
+        reply[0] = 0x24  # LI 0, version 4, mode 4 (server)
+        reply[1] = 1     # stratum 1
+        reply[24:32] = data[40:48]  # originate = client's transmit stamp
+        struct.pack_into("!II", reply, 32, *ntp_stamp(received))
+        if self.delay:
+            asyncio.get_running_loop().call_later(self.delay, self.send, reply, addr)
+        else:
+            self.send(reply, addr)
+
+    def send(self, reply, addr):
+        struct.pack_into("!II", reply, 40, *ntp_stamp(time.time() + self.offset))
+        self.transport.sendto(bytes(reply), addr)
+
+async def start(host="127.0.0.1", port=0, offset=0.0, delay=0.0):
+    """Start the stand-in; returns (server, bound port)"""
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(
+        lambda: NTPServer(offset, delay), local_addr=(host, port))
+    return server, transport.get_extra_info('sockname')[1]
@@ -0,0 +1,16 @@
+"""
+Stand-in for ntptime: sets the simulated RTC from the host clock
+"""
+import time as _time
+
+from sim import machine
+
+host = "pool.ntp.org"
+timeout = 1
+
+def time():
+    return int(_time.time())
+
+def settime():
+    t = _time.gmtime()
+    machine.RTC().datetime((t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0))
@@ -0,0 +1,19 @@
+"""
+uasyncio mapped onto CPython's asyncio
+"""
+import asyncio
+from asyncio import *  # noqa: F401,F403
+
+# Servers started by the firmware, so the host can find their ports
+servers = []
+
+async def sleep_ms(ms):
+    await asyncio.sleep(ms / 1000)
+
+async def wait_for_ms(aw, timeout):
+    return await asyncio.wait_for(aw, timeout / 1000)
+
+async def start_server(callback, host, port, backlog=5):
+    server = await asyncio.start_server(callback, host, port, backlog=backlog)
+    servers.append(server)
+    return server
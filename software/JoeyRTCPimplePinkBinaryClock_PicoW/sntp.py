@@ -0,0 +1,83 @@
+"""
+Non-blocking SNTP client for Pimple Pink Binary Clock
+Queries an NTP server over a non-blocking UDP socket, yielding to the
+event loop while it waits for the reply
+"""
+import socket
+import struct
+import time
+import uasyncio as asyncio
+
+# Seconds between the NTP epoch (1900) and the port's time epoch
+if time.gmtime(0)[0] == 2000:
+    NTP_DELTA = 3155673600
+else:
+    NTP_DELTA = 2208988800
+
+POLL_MS = 10  # How often to check the socket for the reply
+
+def ntp_ms(packet, offset):
+    """Read a 64-bit NTP timestamp as milliseconds since the port's epoch"""
+    seconds, fraction = struct.unpack_from("!II", packet, offset)
+    return (seconds - NTP_DELTA) * 1000 + (fraction * 1000 >> 32)
+
+class SNTPClient:
+    """One-shot SNTP queries with round-trip measurement"""
+    def __init__(self):
+        self.packet = bytearray(48)
+        self.address = None
+        self.host = None
+
+    def resolve(self, host, port):
+        """Look the server up once and reuse the address"""
+        if self.address is None or self.host != (host, port):
+            # getaddrinfo blocks, so it only runs on first use or after a failure
+            self.address = socket.getaddrinfo(host, port, 0, socket.SOCK_DGRAM)[0][-1]
+            self.host = (host, port)
+        return self.address
+
+    async def query(self, host, port=123, timeout_ms=2000):
+        """Ask the server for the time
+
+        Returns (server_ms, rtt_ms, received_ticks): the server's UTC time in
+        milliseconds at the moment the reply arrived, the round-trip delay
+        excluding server processing, and the ticks_ms() of arrival.
+        Raises OSError on timeout or a malformed reply.
+        """
+        address = self.resolve(host, port)
+        packet = self.packet
+        packet[0] = 0x1B  # LI 0, version 3, mode 3 (client)
+        for i in range(1, 48):
+            packet[i] = 0
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setblocking(False)
+            sent = time.ticks_ms()
+            sock.sendto(packet, address)
+            deadline = time.ticks_add(sent, timeout_ms)
+            while True:
+                try:
+                    reply = sock.recv(48)
+                    if reply:
+                        break
+                except OSError:
+                    pass
+                if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
+                    self.address = None
+                    raise OSError("NTP timeout")
+                await asyncio.sleep_ms(POLL_MS)
+            received = time.ticks_ms()
+        finally:
+            sock.close()
+
+        if len(reply) < 48 or reply[0] & 0x07 != 4 or reply[1] == 0:
+            raise OSError("bad NTP reply")
+
+        # Server receive (t2) and transmit (t3) stamps
+        server_received = ntp_ms(reply, 32)
+        server_sent = ntp_ms(reply, 40)
+        rtt = time.ticks_diff(received, sent) - (server_sent - server_received)
+        if rtt < 0:
+            rtt = 0
+        return server_sent + rtt // 2, rtt, received
@@ -0,0 +1,76 @@
+"""
+Static asset store for Pimple Pink Binary Clock
+Serves gzip files uploaded to flash by install_micropython.py, streaming
+them through one reusable buffer so RAM use doesn't grow with file size
+"""
+import os
+import binascii
+
+# Content types by the extension under the .gz suffix
+CONTENT_TYPES = {
+    'css': 'text/css',
+    'js': 'application/javascript',
+    'html': 'text/html',
+    'json': 'application/json',
+    'svg': 'image/svg+xml',
+    'ico': 'image/x-icon',
+}
+
+class StaticStore:
+    """Index of the pre-compressed assets in one flash directory"""
+    def __init__(self, directory, chunk_size=512):
+        self.directory = directory
+        self.buf = bytearray(chunk_size)
+        self.view = memoryview(self.buf)
+        self.files = {}
+        self.scan()
+
+    def scan(self):
+        """Find name.ext.gz files; only these names can ever be served"""
+        self.files = {}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            print(f"⚠️ No static assets in /{self.directory}")
+            return
+        for name in names:
+            if not name.endswith('.gz'):
+                continue
+            path = self.directory + '/' + name
+            # Head and ETag are built on first request, see lookup()
+            self.files[name[:-3]] = [path, os.stat(path)[6], None, None]
+
+    def lookup(self, name):
+        """Return (path, size, head, etag) for an asset, or None"""
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        if entry[2] is None:
+            etag = '"%08x"' % self.checksum(entry[0])
+            content_type = CONTENT_TYPES.get(name.rsplit('.', 1)[-1], 'application/octet-stream')
+            entry[2] = ('HTTP/1.1 200 OK\r\nContent-Type: ' + content_type + '\r\n'
+                        'Content-Encoding: gzip\r\nCache-Control: no-cache\r\n'
+                        'ETag: ' + etag + '\r\n').encode()
+            entry[3] = etag
+        return entry
+
+    def checksum(self, path):
+        """CRC32 of a file, read through the shared buffer"""
+        crc = 0
+        with open(path, 'rb') as f:
+            while True:
+                count = f.readinto(self.buf)
+                if not count:
+                    return crc
+                crc = binascii.crc32(self.view[:count], crc)
+
+    async def stream(self, writer, path):
+        """Copy a file to the client one buffer at a time"""
+        with open(path, 'rb') as f:
+            while True:
+                count = f.readinto(self.buf)
+                if not count:
+                    return
+                writer.write(self.view[:count])
+                # The buffer is reused, so each chunk must leave before the next read
+                await writer.drain()
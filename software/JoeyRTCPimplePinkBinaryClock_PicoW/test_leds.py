@@ -5,6 +5,7 @@ import time
 import machine
 import neopixel
 from machine import Pin
+from framebuffer import FrameBuffer
 
 # Configuration
 NEOPIXEL_PIN = 2
@@ -17,12 +18,12 @@ OFF = (0, 0, 0)
 
 # Initialize NeoPixels
 np = neopixel.NeoPixel(Pin(NEOPIXEL_PIN), NUM_PIXELS)
+fb = FrameBuffer(NUM_PIXELS, np)
 onboard_led = Pin("LED", Pin.OUT)
 
 def clear_all():
     """Clear all LEDs"""
-    for i in range(NUM_PIXELS):
-        np[i] = OFF
+    fb.fill(OFF)
     np.write()
 
 def test_individual_leds():
@@ -32,26 +33,24 @@ def test_individual_leds():
     
     for i in range(NUM_PIXELS):
         print(f"LED {i}")
-        np[i] = PINK
+        fb.set(i, PINK)
         np.write()
         time.sleep(0.2)
-        np[i] = OFF
+        fb.set(i, OFF)
         np.write()
         time.sleep(0.1)
 
 def test_all_pink():
     """Test all LEDs pink"""
     print("💖 All LEDs pink...")
-    for i in range(NUM_PIXELS):
-        np[i] = PINK
+    fb.fill(PINK)
     np.write()
     time.sleep(2)
 
 def test_all_green():
     """Test all LEDs green"""
     print("💚 All LEDs green...")
-    for i in range(NUM_PIXELS):
-        np[i] = GREEN
+    fb.fill(GREEN)
     np.write()
     time.sleep(2)
 
@@ -63,12 +62,12 @@ def heartbeat_test():
         onboard_led.on()
         
         # Pulse LED
-        np[0] = PINK
+        fb.set(0, PINK)
         np.write()
         time.sleep(0.1)
         
         onboard_led.off()
-        np[0] = OFF
+        fb.set(0, OFF)
         np.write()
         time.sleep(0.4)
 
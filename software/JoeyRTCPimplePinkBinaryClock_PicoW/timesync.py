@@ -0,0 +1,116 @@
+"""
+NTP time sync for Pimple Pink Binary Clock
+Imported by main.py once WiFi is up
+"""
+import time
+import uasyncio as asyncio
+import core
+from core import rtc, NTP_SERVER, NTP_PORT, NTP_TIMEOUT_MS, NTP_RETRY_INTERVAL, \
+    UPDATE_INTERVAL, TIMEZONE_OFFSET, SECOND_POLL_MS
+from metrics import SLOW_BUCKETS
+from net import wifi
+from sntp import SNTPClient
+
+ntp_rtt_seconds = core.metrics.histogram(
+    'clock_ntp_rtt_seconds', 'NTP round-trip time', SLOW_BUCKETS)
+
+class TimeSync:
+    """Periodic NTP resync with round-trip and RTC drift tracking"""
+    def __init__(self):
+        self.client = SNTPClient()
+        self.wake = asyncio.Event()
+        self.ok = False
+        self.syncs = 0
+        self.failures = 0
+        self.offset_ms = 0   # NTP time minus RTC time at the last sync
+        self.rtt_ms = 0
+        self.drift_ppm = 0   # RTC rate error between the last two syncs
+        self.last_sync = None
+
+    def request(self):
+        """Ask the background task to resync now; returns immediately"""
+        self.wake.set()
+
+    def record(self, offset_ms, rtt_ms):
+        """Store the result of a successful query"""
+        now = time.ticks_ms()
+        if self.last_sync is not None:
+            elapsed = time.ticks_diff(now, self.last_sync)
+            if elapsed > 0:
+                self.drift_ppm = offset_ms * 1000000 // elapsed
+        self.offset_ms = offset_ms
+        self.rtt_ms = rtt_ms
+        self.last_sync = now
+        self.syncs += 1
+
+    async def run(self):
+        """Resync every UPDATE_INTERVAL, or sooner when requested"""
+        while True:
+            interval = UPDATE_INTERVAL if self.ok else NTP_RETRY_INTERVAL
+            try:
+                await asyncio.wait_for(self.wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            await sync_time()
+
+ntp = TimeSync()
+
+async def rtc_rollover():
+    """Wait for the RTC's next second; returns (its time in seconds, ticks_ms at the edge)
+
+    The RTC only reads whole seconds, so a plain reading is up to 999 ms
+    behind. At the edge it is exact, to within SECOND_POLL_MS.
+    """
+    start = rtc.datetime()[6]
+    deadline = time.ticks_add(time.ticks_ms(), 1000 + 4 * SECOND_POLL_MS)
+    while time.ticks_diff(deadline, time.ticks_ms()) > 0:
+        await asyncio.sleep_ms(SECOND_POLL_MS)
+        dt = rtc.datetime()
+        if dt[6] != start:
+            edge = time.ticks_ms()
+            return int(time.mktime((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6], 0, 0, 0))), edge
+    raise OSError("RTC is not ticking")
+
+async def sync_time():
+    """Synchronize time with NTP server"""
+    if wifi.connected:
+        try:
+            print("Syncing time with NTP...")
+            server_ms, rtt, received = await ntp.client.query(NTP_SERVER, NTP_PORT, NTP_TIMEOUT_MS)
+            
+            # Local time per the server and per the RTC, compared at the RTC's second edge
+            rtc_s, edge = await rtc_rollover()
+            server_ms += time.ticks_diff(edge, received) + TIMEZONE_OFFSET * 3600000
+            ntp.record(server_ms - rtc_s * 1000, rtt)
+            ntp_rtt_seconds.observe(rtt * 1000)
+            
+            # Set the RTC on the next whole second so it ticks in step with the server
+            server_ms += time.ticks_diff(time.ticks_ms(), edge)
+            await asyncio.sleep_ms(1000 - server_ms % 1000)
+            current_time = time.localtime(server_ms // 1000 + 1)
+            rtc.datetime((
+                current_time[0],  # year
+                current_time[1],  # month
+                current_time[2],  # day
+                current_time[6],  # weekday
+                current_time[3],  # hour
+                current_time[4],  # minute
+                current_time[5],  # second
+                0                 # subsecond
+            ))
+            ntp.ok = True
+            print(f"Time synced: {current_time[3]:02d}:{current_time[4]:02d}:{current_time[5]:02d} "
+                  f"(offset {ntp.offset_ms} ms, drift {ntp.drift_ppm} ppm, rtt {rtt} ms)")
+            return True
+        except Exception as e:
+            ntp.ok = False
+            ntp.failures += 1
+            print(f"NTP sync failed: {e}")
+            return False
+    return False
+
+core.metrics.gauge('clock_ntp_offset_seconds', 'NTP minus RTC time at the last sync',
+                   read=lambda: ntp.offset_ms, scale=1000)
+core.metrics.counter('clock_ntp_syncs_total', 'Successful NTP syncs', read=lambda: ntp.syncs)
+core.metrics.counter('clock_ntp_failures_total', 'Failed NTP syncs', read=lambda: ntp.failures)
@@ -0,0 +1,614 @@
+"""
+Web interface for Pimple Pink Binary Clock
+Control page, JSON/SSE/metrics endpoints and the HTTP/1.1 server.
+Imported by main.py once WiFi is up.
+"""
+import time
+import json
+import binascii
+import uasyncio as asyncio
+import core
+from core import clock, fb, heap, metrics, get_current_time, redraw, \
+    set_brightness, set_mode, set_palette, MODES, PALETTES, WEB_PORT, WEB_TIMEOUT, \
+    MAX_REQUEST_LINE, MAX_HEADER_LINE, MAX_HEADERS, MAX_BODY, EVENTS_MAX_CLIENTS, \
+    STATIC_DIR, STATIC_CHUNK
+from metrics import SLOW_BUCKETS
+from net import wifi
+from static import StaticStore
+from timesync import ntp
+
+web_server_running = False
+
+# Control page, split at boot into pre-encoded static chunks around a small
+# dynamic status block. The ETag covers the static chunks only; the page
+# refreshes every dynamic value from /status as soon as it loads.
+PAGE_HEAD = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>🕐 Pimple Pink Binary Clock</title>
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <link rel="stylesheet" href="/static/style.css">
+        <script src="/static/app.js"></script>
+    </head>
+    <body>
+        <div class="header">
+            <h1>🕐 Pimple Pink Binary Clock</h1>
+            <p>IoT Binary Clock Control Panel</p>
+        </div>
+        """.encode()
+
+# LED mirror rows from the board layout: "|" between rows, strip indices in each
+PIXEL_ROWS = '|'.join(' '.join(str(pixel) for pixel in row) for row in clock.layout.rows())
+
+PAGE_TAIL = ("""
+        <div class="grid" id="pixels" data-rows='""" + PIXEL_ROWS + """'></div>
+        
+        <div class="controls">
+            <button onclick="sendCommand('mode/binary')">Binary Mode</button>
+            <button onclick="sendCommand('mode/rainbow')">Rainbow Mode</button>
+            <button onclick="sendCommand('brightness/up')">Brighter</button>
+            <button onclick="sendCommand('brightness/down')">Dimmer</button>
+            <button onclick="sendCommand('sync')">Sync Time</button>
+            <button onclick="sendCommand('clear')">Clear Display</button>
+        </div>
+        
+        <div class="slider-container">
+            <label for="brightness">Brightness: <span id="brightness-label"></span>%</label>
+            <input type="range" id="brightness" class="slider" min="10" max="100"
+                   onchange="sendCommand('brightness/' + this.value)">
+        </div>
+        
+        <div class="status">
+            <h3>Binary Time Explanation</h3>
+            <p>• Hour pixels: Hours in binary</p>
+            <p>• Minute pixels: Minutes in binary</p>
+            <p>• Seconds indicator (if fitted): blinks</p>
+            <p>• Pink pixels = 1, Dark pixels = 0</p>
+        </div>
+    </body>
+    </html>
+    """).encode()
+
+PAGE_ETAG = '"%08x"' % binascii.crc32(PAGE_TAIL, binascii.crc32(PAGE_HEAD))
+PAGE_HEADERS = ('HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n'
+                'Cache-Control: no-cache\r\nETag: ' + PAGE_ETAG + '\r\n').encode()
+PAGE_NOT_MODIFIED = ('HTTP/1.1 304 Not Modified\r\nETag: ' + PAGE_ETAG + '\r\n').encode()
+
+# CSS and JavaScript for the page, served gzipped from flash
+assets = StaticStore(STATIC_DIR, STATIC_CHUNK)
+
+def webpage(ip_address):
+    """Generate the web interface HTML as (static, dynamic, static) byte chunks"""
+    current_time = get_current_time()
+    time_str = f"{current_time[0]:02d}:{current_time[1]:02d}:{current_time[2]:02d}"
+    
+    status = f"""
+        <div class="time-display" id="time">{time_str}</div>
+        
+        <div class="status">
+            <h2>System Status</h2>
+            <p>✅ WiFi: Connected ({ip_address})</p>
+            <p>🕒 Current Time: <span id="status-time">{time_str}</span></p>
+            <p>⏱️ Uptime: <span id="uptime">{time.ticks_ms() // 1000}</span>s</p>
+            <p>🎨 Display Mode: <span id="mode">{core.display_mode}</span></p>
+            <p>💡 Brightness: <span id="brightness-value">{core.brightness}</span>%</p>
+        </div>
+        """
+    return (PAGE_HEAD, status.encode(), PAGE_TAIL)
+
+# Pre-encoded response heads; write_head() adds length and connection headers
+HTML_HEADERS = b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n'
+JSON_HEADERS = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+NOT_ALLOWED_HEADERS = b'HTTP/1.1 405 Method Not Allowed\r\nContent-Type: text/html\r\n'
+BAD_REQUEST_HEADERS = b'HTTP/1.1 400 Bad Request\r\nContent-Type: text/html\r\n'
+URI_TOO_LONG_HEADERS = b'HTTP/1.1 414 URI Too Long\r\nContent-Type: text/html\r\n'
+HEADERS_TOO_LARGE_HEADERS = (b'HTTP/1.1 431 Request Header Fields Too Large\r\n'
+                             b'Content-Type: text/html\r\n')
+PAYLOAD_TOO_LARGE_HEADERS = b'HTTP/1.1 413 Payload Too Large\r\nContent-Type: text/html\r\n'
+NOT_FOUND_HEADERS = b'HTTP/1.1 404 Not Found\r\nContent-Type: text/html\r\n'
+FRAME_HEADERS = ('HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n'
+                 'Cache-Control: no-store\r\nContent-Length: %d\r\n' % len(fb.buf)).encode()
+METRICS_HEADERS = b'HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n'
+JSON_BAD_REQUEST_HEADERS = b'HTTP/1.1 400 Bad Request\r\nContent-Type: application/json\r\n'
+CONNECTION_CLOSE = b'Connection: close\r\n'
+
+def write_head(writer, head, length, keep_alive):
+    """Write a response head with Content-Length and Connection headers"""
+    writer.write(head)
+    if length is not None:
+        writer.write(b'Content-Length: ' + str(length).encode() + b'\r\n')
+    if not keep_alive:
+        writer.write(CONNECTION_CLOSE)
+    writer.write(b'\r\n')
+
+def send(writer, head, body, keep_alive):
+    """Write a complete response with a str or bytes body"""
+    if isinstance(body, str):
+        body = body.encode()
+    write_head(writer, head, len(body), keep_alive)
+    writer.write(body)
+
+# Route handlers are coroutines taking (writer, request, keep_alive, arg), where
+# arg is the path after a prefix route's prefix. They return a body to send
+# with the route's head, or None if they wrote the response themselves.
+
+async def page_route(writer, request, keep_alive, arg):
+    """Main page: only the status block is built per request"""
+    if request.etag == PAGE_ETAG:
+        write_head(writer, PAGE_NOT_MODIFIED, None, keep_alive)
+    else:
+        chunks = webpage(wifi.ip or "Unknown")
+        write_head(writer, PAGE_HEADERS,
+                   len(chunks[0]) + len(chunks[1]) + len(chunks[2]), keep_alive)
+        for chunk in chunks:
+            writer.write(chunk)
+
+async def status_route(writer, request, keep_alive, arg):
+    """Status API, straight from this tick's snapshot"""
+    current = snapshot.get()
+    write_head(writer, current.head, None, keep_alive)
+    writer.write(current.body)
+
+async def mode_route(writer, request, keep_alive, new_mode):
+    """Change display mode"""
+    if new_mode in MODES:
+        set_mode(new_mode)
+        snapshot.invalidate()
+    return f"Mode changed to {core.display_mode}"
+
+async def brightness_route(writer, request, keep_alive, level):
+    """Change brightness"""
+    try:
+        if level == 'up':
+            set_brightness(core.brightness + 10)
+        elif level == 'down':
+            set_brightness(core.brightness - 10)
+        else:
+            set_brightness(int(level))
+    except ValueError:
+        pass
+    snapshot.invalidate()
+    return f"Brightness set to {core.brightness}%"
+
+async def palette_route(writer, request, keep_alive, name):
+    """Change the binary mode palette"""
+    if name in PALETTES:
+        set_palette(name)
+        snapshot.invalidate()
+    return f"Palette changed to {core.palette}"
+
+async def frame_route(writer, request, keep_alive, arg):
+    """Raw framebuffer: NUM_PIXELS * 3 bytes in GRB order, nothing to encode"""
+    write_head(writer, FRAME_HEADERS, None, keep_alive)
+    writer.write(fb.buf)
+
+async def metrics_route(writer, request, keep_alive, arg):
+    """Prometheus scrape, streamed a metric at a time; closing the connection ends the body"""
+    request.connection = b'close'
+    write_head(writer, METRICS_HEADERS, None, False)
+    for chunk in metrics.chunks():
+        writer.write(chunk.encode())
+        await writer.drain()
+
+async def sync_route(writer, request, keep_alive, arg):
+    """Sync time in the background"""
+    ntp.request()
+    return "Time sync started"
+
+async def clear_route(writer, request, keep_alive, arg):
+    """Clear display"""
+    clock.clear_display()
+    return "Display cleared"
+
+async def apply_route(writer, request, keep_alive, arg):
+    """Apply several settings from one JSON body, all or nothing"""
+    try:
+        settings = json.loads(request.body)
+    except ValueError:
+        send(writer, JSON_BAD_REQUEST_HEADERS, '{"error": "invalid JSON"}', keep_alive)
+        return
+    try:
+        mode = settings.get('mode', core.display_mode)
+        level = settings.get('brightness', core.brightness)
+        new_palette = settings.get('palette', core.palette)
+        # Exact types first, so lists, floats and bools never reach the lookups
+        if type(mode) is not str or type(new_palette) is not str or type(level) is not int:
+            raise TypeError
+        if mode not in MODES or new_palette not in PALETTES or not 10 <= level <= 100:
+            raise ValueError
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        send(writer, JSON_BAD_REQUEST_HEADERS, '{"error": "invalid setting"}', keep_alive)
+        return
+        
+    # Everything validated: apply together and draw once
+    set_mode(mode)
+    set_brightness(level)
+    set_palette(new_palette)
+    snapshot.invalidate()
+    redraw()
+    await status_route(writer, request, keep_alive, arg)
+
+async def static_route(writer, request, keep_alive, name):
+    """Gzipped asset from flash, streamed a chunk at a time"""
+    entry = assets.lookup(name)
+    if entry is None:
+        send(writer, NOT_FOUND_HEADERS, "Not found", keep_alive)
+        return
+    path, size, head, etag = entry
+    if request.etag == etag:
+        write_head(writer, b'HTTP/1.1 304 Not Modified\r\nETag: ' + etag.encode() + b'\r\n',
+                   None, keep_alive)
+        return
+    write_head(writer, head, size, keep_alive)
+    await assets.stream(writer, path)
+
+# Route table, built once: path -> (method, handler, response head)
+ROUTES = {
+    '/': ('GET', page_route, PAGE_HEADERS),
+    '/status': ('GET', status_route, JSON_HEADERS),
+    '/frame': ('GET', frame_route, None),
+    '/metrics': ('GET', metrics_route, None),
+    '/sync': ('GET', sync_route, HTML_HEADERS),
+    '/clear': ('GET', clear_route, HTML_HEADERS),
+    '/api/apply': ('POST', apply_route, JSON_HEADERS),
+}
+
+# Checked in order when no exact route matches
+PREFIX_ROUTES = (
+    ('/mode/', ('GET', mode_route, HTML_HEADERS)),
+    ('/brightness/', ('GET', brightness_route, HTML_HEADERS)),
+    ('/palette/', ('GET', palette_route, HTML_HEADERS)),
+    ('/static/', ('GET', static_route, None)),
+)
+
+# Latency is recorded for the routes that carry traffic; the settings
+# commands, 404s and 405s share 'other'
+ROUTE_LABELS = ('/', '/status', '/frame', '/metrics', '/static/', '/api/apply', 'other')
+ROUTE_INDEX = {label: i for i, label in enumerate(ROUTE_LABELS)}
+OTHER_ROUTE = len(ROUTE_LABELS) - 1
+request_seconds = metrics.histogram(
+    'clock_http_request_seconds', 'Time to answer a request', SLOW_BUCKETS,
+    label='route', labels=ROUTE_LABELS)
+bad_requests = metrics.counter('clock_http_bad_requests_total', 'Requests rejected by the parser')
+
+async def handle_request(writer, request, keep_alive):
+    """Look the request up in the route table and answer it
+
+    Returns the route's latency label index in ROUTE_LABELS.
+    """
+    path = request.path
+    arg = None
+    label = path
+    route = ROUTES.get(path)
+    if route is None:
+        for prefix, prefix_route in PREFIX_ROUTES:
+            if path.startswith(prefix):
+                route = prefix_route
+                arg = path[len(prefix):]
+                label = prefix
+                break
+    if route is None:
+        send(writer, NOT_FOUND_HEADERS, "Not found", keep_alive)
+        return OTHER_ROUTE
+        
+    method, handler, head = route
+    if request.method != method:
+        write_head(writer, NOT_ALLOWED_HEADERS, 0, keep_alive)
+        return OTHER_ROUTE
+    body = await handler(writer, request, keep_alive, arg)
+    if body is not None:
+        send(writer, head, body, keep_alive)
+    return ROUTE_INDEX.get(label, OTHER_ROUTE)
+
+def status_json(current_time):
+    """Status as a JSON string"""
+    status = {
+        'time': f"{current_time[0]:02d}:{current_time[1]:02d}:{current_time[2]:02d}",
+        'uptime': time.ticks_ms() // 1000,
+        'mode': core.display_mode,
+        'brightness': core.brightness,
+        'palette': core.palette,
+        'wifi': wifi.connected,
+        'mem_free': heap.sample(),
+        'mem_low': heap.low
+    }
+    return json.dumps(status)
+
+class StatusSnapshot:
+    """Pre-encoded /status response shared by every request in a tick"""
+    def __init__(self):
+        self.key = None
+        self.head = b''
+        self.body = b''
+        self.builds = 0
+
+    def update(self, current_time):
+        """Rebuild if time, mode, brightness, palette or WiFi state changed"""
+        key = (current_time, core.display_mode, core.brightness, core.palette, wifi.connected)
+        if key == self.key:
+            return False
+        self.key = key
+        self.body = status_json(current_time).encode()
+        self.head = JSON_HEADERS + b'Content-Length: ' + str(len(self.body)).encode() + b'\r\n'
+        self.builds += 1
+        return True
+
+    def invalidate(self):
+        """Settings changed; rebuild on the next request instead of the next tick"""
+        self.key = None
+
+    def get(self):
+        """Current snapshot, built now if invalidated"""
+        if self.key is None:
+            self.update(get_current_time())
+        return self
+
+snapshot = StatusSnapshot()
+
+EVENTS_HEADERS = (b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                  b'Cache-Control: no-cache\r\n\r\n')
+BUSY_HEADERS = b'HTTP/1.1 503 Service Unavailable\r\nContent-Type: text/html\r\n'
+
+class EventStream:
+    """Server-Sent Events: one encoded message per tick, shared by all subscribers"""
+    def __init__(self):
+        self.clients = []   # [writer, flushing] pairs
+        self.message = None
+        self.broadcasts = 0
+        self.dropped = 0
+
+    async def serve(self, reader, writer):
+        """Hold a subscriber's connection open until it goes away"""
+        if len(self.clients) >= EVENTS_MAX_CLIENTS:
+            write_head(writer, BUSY_HEADERS, 0, False)
+            await writer.drain()
+            return
+        writer.write(EVENTS_HEADERS)
+        if self.message:
+            writer.write(self.message)
+        await writer.drain()
+        client = [writer, False]
+        self.clients.append(client)
+        try:
+            # Subscribers never send anything; an empty read means they left
+            while await reader.read(64):
+                pass
+        except Exception:
+            pass
+        self.remove(client)
+
+    def publish(self):
+        """Push this tick's status snapshot and frame to every subscriber"""
+        if not self.clients:
+            self.message = None
+            return
+        # Status, then the LED frame as hex under its own event name, so
+        # dashboards mirror the strip without each fetching /frame
+        self.message = (b'data: ' + snapshot.body + b'\n\nevent: frame\ndata: ' +
+                        binascii.hexlify(fb.buf) + b'\n\n')
+        self.broadcasts += 1
+        for i in range(len(self.clients) - 1, -1, -1):
+            client = self.clients[i]
+            if client[1]:
+                # Still flushing the last event: drop the client instead of buffering
+                self.dropped += 1
+                self.remove(client)
+                continue
+            client[1] = True
+            client[0].write(self.message)
+            asyncio.create_task(self.flush(client))
+
+    async def flush(self, client):
+        """Drain one subscriber; a failure drops it"""
+        try:
+            await client[0].drain()
+            client[1] = False
+        except Exception:
+            self.remove(client)
+
+    def remove(self, client):
+        """Forget a subscriber and close its connection"""
+        if client in self.clients:
+            self.clients.remove(client)
+            try:
+                client[0].close()
+            except Exception:
+                pass
+
+events = EventStream()
+
+READ_CHUNK = 256  # Bytes pulled from the socket per read
+
+class RequestError(Exception):
+    """A request the parser refuses; carries the response head to send"""
+    def __init__(self, head):
+        super().__init__()
+        self.head = head
+
+class Request:
+    """Bounded, time-limited request parser, reused for every request on a connection"""
+    def __init__(self, reader):
+        self.reader = reader
+        self.buf = b''
+        self.reset()
+
+    def reset(self):
+        """Clear the fields of the previous request"""
+        self.method = None
+        self.path = None
+        self.query = None
+        self.version = None
+        self.etag = None
+        self.connection = None
+        self.content_type = None
+        self.content_length = 0
+        self.body = b''
+
+    async def read_line(self, limit, deadline, error_head):
+        """Next line (with its newline), b'' at EOF; never buffers more than limit"""
+        while True:
+            end = self.buf.find(b'\n')
+            if end >= 0:
+                if end >= limit:
+                    raise RequestError(error_head)
+                line = self.buf[:end + 1]
+                self.buf = self.buf[end + 1:]
+                return line
+            if len(self.buf) >= limit:
+                raise RequestError(error_head)
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            chunk = await asyncio.wait_for_ms(self.reader.read(READ_CHUNK), remaining)
+            if not chunk:
+                return b''
+            self.buf += chunk
+
+    async def read(self):
+        """Parse the next request; False if the client went away or idled out"""
+        self.reset()
+        
+        # Wait for a request line; keep-alive connections idle out after WEB_TIMEOUT
+        deadline = time.ticks_add(time.ticks_ms(), WEB_TIMEOUT * 1000)
+        line = b'\r\n'
+        while line in (b'\r\n', b'\n'):
+            line = await self.read_line(MAX_REQUEST_LINE, deadline, URI_TOO_LONG_HEADERS)
+        if not line:
+            return False
+        parts = line.split()
+        if len(parts) not in (2, 3):
+            raise RequestError(BAD_REQUEST_HEADERS)
+        try:
+            self.method = parts[0].decode()
+            target = parts[1].decode()
+            self.version = parts[2].decode() if len(parts) == 3 else 'HTTP/1.0'
+        except UnicodeError:
+            raise RequestError(BAD_REQUEST_HEADERS)
+        split = target.find('?')
+        if split >= 0:
+            self.path = target[:split]
+            self.query = target[split + 1:]
+        else:
+            self.path = target
+            
+        # The whole header block has to arrive within WEB_TIMEOUT
+        deadline = time.ticks_add(time.ticks_ms(), WEB_TIMEOUT * 1000)
+        for _ in range(MAX_HEADERS + 1):
+            line = await self.read_line(MAX_HEADER_LINE, deadline, HEADERS_TOO_LARGE_HEADERS)
+            if not line:
+                return False
+            if line in (b'\r\n', b'\n'):
+                await self.read_body(deadline)
+                return True
+            colon = line.find(b':')
+            if colon <= 0:
+                raise RequestError(BAD_REQUEST_HEADERS)
+            name = line[:colon].lower()
+            value = line[colon + 1:].strip()
+            try:
+                if name == b'if-none-match':
+                    self.etag = value.decode()
+                elif name == b'connection':
+                    self.connection = value.lower()
+                elif name == b'content-type':
+                    self.content_type = value.decode()
+                elif name == b'content-length':
+                    self.content_length = int(value.decode())
+                    if self.content_length < 0:
+                        # A negative length would slice the body off the buffer's end
+                        raise ValueError
+            except (ValueError, UnicodeError):
+                # Not UTF-8, or a length that is not a non-negative number
+                raise RequestError(BAD_REQUEST_HEADERS)
+        raise RequestError(HEADERS_TOO_LARGE_HEADERS)
+
+    async def read_body(self, deadline):
+        """Read a Content-Length body of at most MAX_BODY bytes"""
+        length = self.content_length
+        if length > MAX_BODY:
+            raise RequestError(PAYLOAD_TOO_LARGE_HEADERS)
+        while len(self.buf) < length:
+            remaining = time.ticks_diff(deadline, time.ticks_ms())
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            chunk = await asyncio.wait_for_ms(self.reader.read(READ_CHUNK), remaining)
+            if not chunk:
+                raise asyncio.TimeoutError()
+            self.buf += chunk
+        self.body = self.buf[:length]
+        self.buf = self.buf[length:]
+
+    def keep_alive(self):
+        """HTTP/1.1 stays open unless asked to close; HTTP/1.0 only if asked to stay"""
+        if self.version == 'HTTP/1.1':
+            return self.connection != b'close'
+        return self.connection == b'keep-alive'
+
+async def handle_client(reader, writer):
+    """Serve requests on one connection until it closes or goes idle"""
+    request = Request(reader)
+    try:
+        keep_alive = True
+        while keep_alive:
+            try:
+                if not await request.read():
+                    break
+            except RequestError as e:
+                bad_requests.inc()
+                write_head(writer, e.head, 0, False)
+                await writer.drain()
+                break
+            except asyncio.TimeoutError:
+                break
+            print(f"Request: {request.method} {request.path}")
+            
+            keep_alive = request.keep_alive()
+                
+            if request.method == 'GET' and request.path == '/events':
+                # The connection becomes a one-way event stream
+                await events.serve(reader, writer)
+                break
+                
+            # Pipelined requests are simply read and answered in order
+            start = time.ticks_us()
+            route = await handle_request(writer, request, keep_alive)
+            await writer.drain()
+            request_seconds.observe(time.ticks_diff(time.ticks_us(), start), route)
+            # A handler that sent an unframed body asked for the connection to close
+            keep_alive = keep_alive and request.keep_alive()
+            
+    except Exception as e:
+        print(f"Request handling error: {e}")
+        
+    finally:
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except:
+            pass
+
+async def web_server():
+    """Run the web server"""
+    global web_server_running
+    
+    try:
+        print(f"Starting web server on port {WEB_PORT}...")
+        server = await asyncio.start_server(handle_client, "0.0.0.0", WEB_PORT)
+        web_server_running = True
+        print("Web server running!")
+        
+        async with server:
+            await server.serve_forever()
+            
+    except Exception as e:
+        print(f"Web server error: {e}")
+        web_server_running = False
+
+core.metrics.gauge('clock_events_clients', 'Connected /events subscribers',
+                   read=lambda: len(events.clients))
+
+def tick(current_time):
+    """Called by the frame loop once per second with the RTC time"""
+    snapshot.update(current_time)
+    events.publish()
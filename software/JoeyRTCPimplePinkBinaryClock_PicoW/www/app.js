@@ -0,0 +1,134 @@
+// Pimple Pink Binary Clock control page
+function setText(id, value) {
+    document.getElementById(id).textContent = value;
+}
+
+function showStatus(data) {
+    setText('time', data.time);
+    setText('status-time', data.time);
+    setText('uptime', data.uptime);
+    setText('mode', data.mode);
+    setText('brightness-value', data.brightness);
+    setText('brightness-label', data.brightness);
+    document.getElementById('brightness').value = data.brightness;
+}
+
+// Pixel elements by strip index, one row per hours/minutes/seconds group
+let pixels = null;
+function buildGrid() {
+    const grid = document.getElementById('pixels');
+    pixels = [];
+    for (const row of grid.dataset.rows.split('|')) {
+        if (!row) {
+            continue;
+        }
+        const line = document.createElement('div');
+        line.className = 'pixel-row';
+        for (const index of row.split(' ')) {
+            const pixel = document.createElement('div');
+            pixel.className = 'pixel';
+            pixels[Number(index)] = pixel;
+            line.appendChild(pixel);
+        }
+        grid.appendChild(line);
+    }
+}
+
+// Mirror the LEDs: raw GRB bytes, three per pixel
+function showFrame(bytes) {
+    if (!pixels) {
+        buildGrid();
+    }
+    const count = Math.min(pixels.length, Math.floor(bytes.length / 3));
+    for (let i = 0; i < count; i++) {
+        const pixel = pixels[i];
+        if (!pixel) {
+            continue;
+        }
+        const g = bytes[i * 3], r = bytes[i * 3 + 1], b = bytes[i * 3 + 2];
+        // Frames are brightness-scaled; stretch to full range so dim LEDs stay visible
+        const peak = Math.max(r, g, b);
+        if (peak === 0) {
+            pixel.style.background = '';
+            pixel.style.boxShadow = '';
+            continue;
+        }
+        const k = 255 / peak;
+        const color = `rgb(${Math.round(r * k)}, ${Math.round(g * k)}, ${Math.round(b * k)})`;
+        pixel.style.background = color;
+        pixel.style.boxShadow = `0 0 10px ${color}`;
+    }
+}
+
+// The event stream sends the frame as hex
+function hexBytes(hex) {
+    const bytes = new Uint8Array(hex.length / 2);
+    for (let i = 0; i < bytes.length; i++) {
+        bytes[i] = parseInt(hex.substr(i * 2, 2), 16);
+    }
+    return bytes;
+}
+
+function updateFrame() {
+    fetch('/frame')
+        .then(response => response.arrayBuffer())
+        .then(buffer => showFrame(new Uint8Array(buffer)))
+        .catch(err => console.log('Frame update failed:', err));
+}
+
+// Without the event stream, status and frame are both polled
+function updateClock() {
+    fetch('/status')
+        .then(response => response.json())
+        .then(showStatus)
+        .catch(err => console.log('Update failed:', err));
+    updateFrame();
+}
+
+let polling = null;
+function startPolling() {
+    if (!polling) {
+        polling = setInterval(updateClock, 1000);
+    }
+}
+
+function stopPolling() {
+    if (polling) {
+        clearInterval(polling);
+        polling = null;
+    }
+}
+
+const EVENTS_RETRY_MS = 30000;
+
+// Prefer the pushed status stream; poll /status only while it is unavailable
+function startEvents() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    const source = new EventSource('/events');
+    source.onopen = stopPolling;
+    source.onmessage = e => showStatus(JSON.parse(e.data));
+    source.addEventListener('frame', e => showFrame(hexBytes(e.data)));
+    source.onerror = () => {
+        // After a dropped connection (reboot, WiFi blip) EventSource reconnects
+        // by itself. It gives up only on an error response such as the 503 sent
+        // when the clock has no room for another subscriber.
+        if (source.readyState === EventSource.CLOSED) {
+            startPolling();
+            setTimeout(startEvents, EVENTS_RETRY_MS);
+        }
+    };
+}
+
+window.addEventListener('load', () => {
+    updateClock();
+    startEvents();
+});
+
+function sendCommand(cmd) {
+    fetch('/' + cmd)
+        .then(() => updateClock())
+        .catch(err => console.log('Command failed:', err));
+}